@@ -44,6 +44,197 @@ class TestPriceHistory(unittest.TestCase):
             df_tkrs = df.columns.levels[1]
             self.assertEqual(sorted(tkrs), sorted(df_tkrs))
 
+    def test_download_alignment(self):
+        # Exchanges with different holidays: union of dates, gaps are NaN
+        tkrs = ["BHP.AX", "INTC"]
+        df = yf.download(tkrs, period="1y")
+        self.assertTrue(df.index.is_monotonic_increasing)
+        self.assertTrue(df.index.is_unique)
+        for tkr in tkrs:
+            df_tkr = yf.Ticker(tkr, session=self.session).history(period="1y", auto_adjust=False)
+            close = df["Close"][tkr].dropna()
+            self.assertTrue((close.values == df_tkr["Close"].values).all())
+
+    def test_download_long(self):
+        tkrs = ["BHP.AX", "BP.L", "INTC"]
+        df_long = yf.download(tkrs, period="1mo", layout="long")
+        df_wide = yf.download(tkrs, period="1mo")
+
+        self.assertIsInstance(df_long["Symbol"].dtype, _pd.CategoricalDtype)
+        self.assertEqual(sorted(df_long["Symbol"].unique()), sorted(tkrs))
+        self.assertEqual(df_long["Volume"].dtype, _np.int64)
+        # Long layout defaults to compact dtypes
+        self.assertEqual(df_long["Close"].dtype, _np.float32)
+        df_long64 = yf.download(tkrs, period="1mo", layout="long", dtype_profile="default")
+        self.assertEqual(df_long64["Close"].dtype, _np.float64)
+        for tkr in tkrs:
+            close_long = df_long64.loc[df_long64["Symbol"] == tkr, "Close"].to_numpy()
+            close_wide = df_wide["Close"][tkr].dropna().to_numpy()
+            self.assertTrue((close_long == close_wide).all())
+
+    def test_dtype_profile_compact(self):
+        dat = yf.Ticker("INTC", session=self.session)
+        df = dat.history(period="1y", dtype_profile="compact")
+        df_default = dat.history(period="1y")
+
+        for c in ["Open", "High", "Low", "Close"]:
+            self.assertEqual(df[c].dtype, _np.float32)
+            self.assertTrue(_np.allclose(df[c], df_default[c], rtol=1e-6))
+        self.assertEqual(df["Volume"].dtype, _np.int64)
+        self.assertIsInstance(df["Dividends"].dtype, _pd.SparseDtype)
+        self.assertEqual(df["Dividends"].sum(), df_default["Dividends"].sum())
+
+        with self.assertRaises(ValueError):
+            dat.history(period="1y", dtype_profile="tiny")
+
+    def test_history_incremental(self):
+        dat = yf.Ticker("INTC", session=self.session)
+        df = dat.history(period="1y")
+        df_inc = dat.history(period="1y", previous=df.iloc[:-5])
+
+        self.assertTrue(df_inc.index.is_unique)
+        self.assertTrue(df_inc.index.equals(df.index))
+        self.assertTrue(_np.allclose(df_inc["Close"], df["Close"], rtol=1e-5))
+
+        # Nothing new = previous returned
+        df_inc = dat.history(period="1y", previous=df)
+        self.assertEqual(df_inc.shape, df.shape)
+
+    def test_intraday_1m_long_range(self):
+        # Yahoo serves max 7 days of 1m per request, longer range is split
+        dat = yf.Ticker("INTC", session=self.session)
+        end = _pd.Timestamp.utcnow().floor("D")
+        start = end - _dt.timedelta(days=20)
+        df = dat.history(interval="1m", start=start, end=end)
+
+        self.assertTrue(df.index.is_unique)
+        self.assertTrue(df.index.is_monotonic_increasing)
+        self.assertGreater(df.index[-1] - df.index[0], _dt.timedelta(days=7))
+
+    def test_history_intervals(self):
+        dat = yf.Ticker("INTC", session=self.session)
+        dfs = dat.history_intervals(["5m", "1h", "1d"], period="5d")
+        df_1h = dat.history(interval="1h", period="5d")
+
+        # Derived bars start with sessions, like Yahoo's
+        common = dfs["1h"].index.intersection(df_1h.index)
+        self.assertGreater(len(common), 0.9 * df_1h.shape[0])
+        self.assertTrue(_np.allclose(dfs["1h"].loc[common, "Close"], df_1h.loc[common, "Close"], rtol=1e-3))
+        self.assertEqual(dfs["1d"].shape[0], len(_np.unique(dfs["5m"].index.date)))
+
+    def test_adjust_history(self):
+        dat = yf.Ticker("INTC", session=self.session)
+        df_adj = dat.history(period="1y")
+        df_raw = dat.history(period="1y", auto_adjust=False)
+
+        # Switch adjustment of last fetch without refetching
+        self.assertTrue(dat.adjust_history(auto_adjust=True).equals(df_adj))
+        self.assertTrue(dat.adjust_history(auto_adjust=False).equals(df_raw))
+        df_back = dat.adjust_history(auto_adjust=False, back_adjust=True)
+        self.assertTrue(_np.allclose(df_back["Open"], df_adj["Open"]))
+        self.assertTrue(_np.allclose(df_back["Close"], df_raw["Close"]))
+
+    def test_history_result_independent(self):
+        # Modifying returned frame must not corrupt what Ticker keeps
+        dat = yf.Ticker("INTC", session=self.session)
+        df = dat.history(period="1y", auto_adjust=False, keepna=True)
+        n_divs = len(dat.dividends)
+        df.loc[:, "Dividends"] = 1.0
+        self.assertEqual(len(dat.dividends), n_divs)
+
+    def test_history_memo(self):
+        dat = yf.Ticker("INTC", session=self.session)
+        df_max = dat.history(period="max", auto_adjust=False)
+
+        # Sub-range served from memory, same as fetching it
+        start, end = "2020-01-01", "2020-03-01"
+        df_sub = dat.history(start=start, end=end, auto_adjust=False)
+        df_fetched = yf.Ticker("INTC", session=self.session).history(start=start, end=end, auto_adjust=False)
+        self.assertTrue(df_sub.equals(df_fetched))
+
+        # Actions are from full history, not last range fetched
+        self.assertEqual(len(dat.dividends), (df_max["Dividends"] != 0).sum())
+
+        # Alternating calls both served from memory
+        df_1h = dat.history(period="5d", interval="1h")
+        self.assertTrue(dat.history(period="max", auto_adjust=False).equals(df_max))
+        self.assertTrue(dat.history(period="5d", interval="1h").equals(df_1h))
+
+    def test_actions_events_only(self):
+        # Actions fetched without daily prices must match daily history
+        df_max = yf.Ticker("AAPL", session=self.session).history(period="max", auto_adjust=False)
+        dat = yf.Ticker("AAPL", session=self.session)
+        divs = df_max["Dividends"][df_max["Dividends"] != 0]
+        splits = df_max["Stock Splits"][df_max["Stock Splits"] != 0]
+        self.assertTrue(dat.dividends.equals(divs))
+        self.assertTrue(dat.splits.equals(splits))
+
+    def test_download_concurrent(self):
+        # Concurrent download() calls must not mix up each other's results
+        import threading
+        tkr_groups = [["BHP.AX", "IMP.JO"], ["BP.L", "INTC"]]
+        results = {}
+
+        def _run(i):
+            results[i] = yf.download(tkr_groups[i], period="1mo", progress=False)
+
+        threads = [threading.Thread(target=_run, args=(i,)) for i in range(len(tkr_groups))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        for i in range(len(tkr_groups)):
+            self.assertEqual(sorted(results[i].columns.levels[1]), sorted(tkr_groups[i]))
+
+    def test_download_batch(self):
+        tkrs = ["BHP.AX", "IMP.JO", "BP.L", "PNL.L", "INTC"]
+        df = yf.download(tkrs, period="1mo", batch=True)
+        df_sync = yf.download(tkrs, period="1mo")
+
+        self.assertEqual(sorted(df.columns.levels[1]), sorted(tkrs))
+        self.assertTrue(df.index.equals(df_sync.index))
+        self.assertTrue(((df["Close"] - df_sync["Close"]).abs() < 1e-6).all().all())
+        # Spark has no adjusted closes
+        self.assertNotIn("Adj Close", df.columns.levels[0])
+
+        # Adjusting needs adjusted closes, so batch is ignored
+        df = yf.download(tkrs, period="1mo", batch=True, auto_adjust=True)
+        df_sync = yf.download(tkrs, period="1mo", auto_adjust=True)
+        self.assertTrue(((df["Close"] - df_sync["Close"]).abs() < 1e-6).all().all())
+
+    def test_download_deadline(self):
+        # Deadline passed immediately: nothing fetched, but still returns a frame per ticker
+        tkrs = ["BHP.AX", "BP.L", "INTC"]
+        df = yf.download(tkrs, period="1mo", deadline=0)
+        self.assertEqual(sorted(df.columns.levels[1]), sorted(tkrs))
+
+    def test_download_iter(self):
+        tkrs = ["BHP.AX", "BP.L", "INTC"]
+        dfs = {}
+        for symbol, df, error in yf.download_iter(tkrs, period="1mo"):
+            self.assertIsNone(error)
+            dfs[symbol] = df
+        self.assertEqual(sorted(dfs.keys()), sorted(tkrs))
+
+        df_sync = yf.download(tkrs, period="1mo", group_by="ticker")
+        for tkr in tkrs:
+            self.assertTrue(dfs[tkr]["Close"].equals(df_sync[tkr]["Close"].dropna()))
+
+    def test_async_download(self):
+        try:
+            import aiohttp  # noqa: F401
+        except ImportError:
+            self.skipTest("aiohttp not installed")
+        import asyncio
+
+        tkrs = ["BHP.AX", "BP.L", "INTC"]
+        df = asyncio.run(yf.async_download(tkrs, period="1mo"))
+        df_sync = yf.download(tkrs, period="1mo")
+
+        self.assertEqual(sorted(df.columns.levels[1]), sorted(tkrs))
+        self.assertTrue(df.index.equals(df_sync.index))
+
     def test_duplicatingHourly(self):
         tkrs = ["IMP.JO", "BHG.JO", "SSW.JO", "BP.L", "INTC"]
         for tkr in tkrs:
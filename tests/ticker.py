@@ -815,6 +815,13 @@ class TestTickerInfo(unittest.TestCase):
         for k in f:
             self.assertIsNotNone(f[k])
 
+    def test_fast_info_batch(self):
+        symbols = ["AAPL", "BP.L", "GOOGL"]
+        df = yf.Tickers(symbols, session=self.session).fast_info
+        self.assertEqual(list(df.index), symbols)
+        self.assertEqual(sorted(df.columns), sorted(yf.Ticker("AAPL").fast_info.keys()))
+        self.assertFalse(df[["lastPrice", "currency", "timezone"]].isna().any().any())
+
     def test_info(self):
         data = self.tickers[0].info
         self.assertIsInstance(data, dict, "data has wrong type")
@@ -80,10 +80,419 @@ class TestCacheNoPermission(unittest.TestCase):
         cache.lookup(tkr)
 
 
+class TestResponseCache(unittest.TestCase):
+    def test_evictsBySize(self):
+        cache = yf.cache._ResponseCache(max_bytes=100)
+        cache.store('a', {'v': 1}, 60, ttl=60)
+        cache.store('b', {'v': 2}, 60, ttl=60)
+
+        # 'a' evicted to stay within byte limit
+        self.assertIsNone(cache.lookup('a'))
+        self.assertEqual(cache.lookup('b'), {'v': 2})
+        info = cache.info()
+        self.assertEqual(info['evictions'], 1)
+        self.assertEqual(info['nbytes'], 60)
+
+    def test_expires(self):
+        cache = yf.cache._ResponseCache()
+        cache.store('a', 'text', 10, ttl=0.01)
+        import time
+        time.sleep(0.02)
+        self.assertIsNone(cache.lookup('a'))
+        self.assertEqual(cache.info()['expirations'], 1)
+
+    def test_decodedSize(self):
+        cache = yf.cache._ResponseCache()
+        content = b'{"chart": {"result": [{"timestamp": [1672756200]}]}}'
+        self.assertEqual(cache.estimate_nbytes('json', content, {}), len(content) * cache.json_size_factor)
+        self.assertGreater(cache.estimate_nbytes('text', content, content.decode()), len(content))
+
+    def test_ttlPerEndpoint(self):
+        cache = yf.cache._ResponseCache(ttls={'/v8/finance/chart/': 5})
+        self.assertEqual(cache.ttl_for('https://query2.finance.yahoo.com/v8/finance/chart/MSFT'), 5)
+        self.assertEqual(cache.ttl_for('https://query2.finance.yahoo.com/v1/finance/search'), cache.default_ttl)
+
+
+class TestChartCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tempCacheDir = tempfile.TemporaryDirectory()
+        yf.set_tz_cache_location(cls.tempCacheDir.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tempCacheDir.cleanup()
+
+    def test_storeLookup(self):
+        cache = yf.cache.get_chart_cache()
+        key = cache.make_key('MSFT', '1d', 1672531200, 1677628800, False)
+        data = {"chart": {"result": [{"timestamp": [1672756200]}], "error": None}}
+        cache.store(key, data)
+        self.assertEqual(cache.lookup(key), data)
+        self.assertTrue(os.path.exists(os.path.join(self.tempCacheDir.name, "charts.db")))
+
+        # Different range is a different entry
+        self.assertIsNone(cache.lookup(cache.make_key('MSFT', '1d', 1672531200, 1677628800, True)))
+
+    def test_expires(self):
+        cache = yf.cache.get_chart_cache()
+        key = cache.make_key('AAPL', '1d', 1672531200, 1677628800, False)
+        cache.store(key, {"chart": {}})
+        max_age = cache.max_age
+        try:
+            cache.max_age = max_age * 0
+            self.assertIsNone(cache.lookup(key))
+        finally:
+            cache.max_age = max_age
+        # Expired row was deleted, not just skipped
+        self.assertIsNone(cache.lookup(key))
+
+    def test_prune(self):
+        cache = yf.cache.get_chart_cache()
+        keys = [cache.make_key('MSFT', '1d', i, i + 86400, False) for i in range(5)]
+        for key in keys:
+            cache.store(key, {"chart": {}})
+        max_entries = cache.max_entries
+        try:
+            cache.max_entries = 2
+            cache.prune()
+        finally:
+            cache.max_entries = max_entries
+        self.assertEqual(yf.cache._ChartSchema.select().count(), 2)
+        self.assertIsNotNone(cache.lookup(keys[-1]))
+
+
+class TestPriceStore(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tempCacheDir = tempfile.TemporaryDirectory()
+        yf.set_tz_cache_location(cls.tempCacheDir.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tempCacheDir.cleanup()
+
+    @staticmethod
+    def _prices(start, n, close=1.0):
+        import pandas as pd
+        index = pd.date_range(start, periods=n, freq='D', tz='America/New_York', name='Date')
+        return pd.DataFrame({"Close": close, "Volume": range(n)}, index=index)
+
+    def test_rangeRead(self):
+        store = yf.cache.get_price_store()
+        df = self._prices('2023-01-01', 30)
+        start, end = int(df.index[0].timestamp()), int(df.index[-1].timestamp()) + 86400
+        store.write('MSFT', '1d', df, 'America/New_York', start, end)
+
+        meta = store.read_meta('MSFT', '1d')
+        self.assertTrue(store.covers(meta, start, end))
+        self.assertFalse(store.covers(meta, start, end + 86400))
+
+        part = store.read('MSFT', '1d', int(df.index[5].timestamp()), int(df.index[10].timestamp()))
+        self.assertTrue(part.equals(df.iloc[5:10]))
+        self.assertEqual(str(part.index.tz), 'America/New_York')
+
+    def test_mergeAndReplace(self):
+        store = yf.cache.get_price_store()
+        df = self._prices('2023-01-01', 30)
+        ts = [int(dt.timestamp()) for dt in df.index]
+        store.write('AAPL', '1d', df.iloc[:20], 'America/New_York', ts[0], ts[20])
+        store.write('AAPL', '1d', df.iloc[15:], 'America/New_York', ts[15], ts[-1] + 86400)
+        self.assertTrue(store.read('AAPL', '1d').equals(df))
+        self.assertEqual(store.read_meta('AAPL', '1d')["start"], ts[0])
+
+        # Overlap prices changed (e.g. new split) = old data stale
+        df2 = self._prices('2023-01-20', 20, close=0.5)
+        store.write('AAPL', '1d', df2, 'America/New_York', int(df2.index[0].timestamp()), int(df2.index[-1].timestamp()))
+        self.assertTrue(store.read('AAPL', '1d').equals(df2))
+
+    def test_stale(self):
+        store = yf.cache.get_price_store()
+        df = self._prices('2023-01-01', 30)
+        start, end = int(df.index[0].timestamp()), int(df.index[-1].timestamp()) + 86400
+        store.write('INTC', '1d', df, 'America/New_York', start, end, events=(4, start))
+        meta = store.read_meta('INTC', '1d')
+        self.assertFalse(store.is_stale(meta, (4, start)))
+        # Unknown actions: only age matters
+        self.assertFalse(store.is_stale(meta))
+
+        # New dividend since stored = earlier prices re-adjusted
+        self.assertTrue(store.is_stale(meta, (5, end)))
+
+        max_age = store.max_age
+        try:
+            store.max_age = max_age * 0
+            meta["fetched"] -= 1
+            self.assertTrue(store.is_stale(meta, (4, start)))
+        finally:
+            store.max_age = max_age
+
+    def test_eventsChecked(self):
+        store = yf.cache.get_price_store()
+        df = self._prices('2023-01-01', 30)
+        start, end = int(df.index[0].timestamp()), int(df.index[-1].timestamp()) + 86400
+        store.write('AMD', '1d', df, 'America/New_York', start, end, events=(4, start))
+        meta = store.read_meta('AMD', '1d')
+        self.assertFalse(store.events_due(meta))
+
+        meta["events_checked"] -= store.events_max_age.total_seconds() + 1
+        self.assertTrue(store.events_due(meta))
+        store.set_events_checked('AMD', '1d')
+        self.assertFalse(store.events_due(store.read_meta('AMD', '1d')))
+
+    def test_unreadable(self):
+        import os
+        store = yf.cache.get_price_store()
+        df = self._prices('2023-01-01', 30)
+        start, end = int(df.index[0].timestamp()), int(df.index[-1].timestamp()) + 86400
+        store.write('NVDA', '1d', df, 'America/New_York', start, end)
+        meta = store.read_meta('NVDA', '1d')
+        os.remove(os.path.join(store._dir('NVDA', '1d'), meta["data"], "c0.npy"))
+        self.assertIsNone(store.read('NVDA', '1d'))
+
+        store.drop('NVDA', '1d')
+        self.assertIsNone(store.read_meta('NVDA', '1d'))
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_burstThenWait(self):
+        limiter = yf.data._RateLimiter()
+        waits = [limiter.reserve() for _ in range(limiter.burst + 1)]
+        self.assertEqual(max(waits[:limiter.burst]), 0)
+        self.assertGreater(waits[-1], 0)
+
+    def test_throttleHalvesRate(self):
+        limiter = yf.data._RateLimiter()
+        limiter.on_throttled()
+        self.assertEqual(limiter._rate, limiter.max_rate / 2)
+        limiter.on_success()
+        self.assertGreater(limiter._rate, limiter.max_rate / 2)
+
+    def test_circuitBreaker(self):
+        limiter = yf.data._RateLimiter()
+        for _ in range(limiter.breaker_threshold):
+            limiter.on_throttled()
+        with self.assertRaises(yf.exceptions.YFRateLimitError):
+            limiter.reserve()
+
+    def test_configure(self):
+        limiter = yf.data._RateLimiter()
+        limiter.configure(2, 3)
+        waits = [limiter.reserve() for _ in range(4)]
+        self.assertEqual(max(waits[:3]), 0)
+        self.assertAlmostEqual(waits[-1], 0.5, places=2)
+
+        # Disabled: never waits, but still backs off on throttling
+        limiter.configure(None, 3)
+        self.assertEqual(max(limiter.reserve() for _ in range(100)), 0)
+        limiter.on_throttled(retry_after=5)
+        limiter.on_success()
+        self.assertGreater(limiter.reserve(), 0)
+
+    def test_setRateLimit(self):
+        limiter = yf.data.YfData()._rate_limiter
+        try:
+            yf.set_rate_limit(rate=5, burst=1)
+            self.assertEqual((limiter.max_rate, limiter.burst), (5, 1))
+            with self.assertRaises(ValueError):
+                yf.set_rate_limit(rate=0)
+        finally:
+            yf.set_rate_limit()
+        self.assertEqual((limiter.max_rate, limiter.burst), (20, 20))
+
+    def test_retryAfter(self):
+        self.assertEqual(yf.data._RateLimiter.parse_retry_after("5"), 5)
+        self.assertEqual(yf.data._RateLimiter.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0)
+        self.assertIsNone(yf.data._RateLimiter.parse_retry_after(None))
+
+
+class TestParseQuotes(unittest.TestCase):
+    def test_noneToNan(self):
+        data = {"timestamp": [1672756200, 1672842600, 1672929000],
+                "indicators": {"quote": [{"open": [1.0, None, 3.0], "high": [1.5, None, 3.5],
+                                          "low": [0.5, None, 2.5], "close": [1.2, None, 3.2],
+                                          "volume": [100, None, 300]}]}}
+        df = yf.utils.parse_quotes(data)
+        self.assertEqual(list(df.columns), ["Open", "High", "Low", "Close", "Adj Close", "Volume"])
+        self.assertTrue(df.iloc[1].isna().all())
+        self.assertTrue((df["Adj Close"] == df["Close"]).iloc[[0, 2]].all())
+
+    def test_unsorted(self):
+        data = {"timestamp": [1672842600, 1672756200],
+                "indicators": {"quote": [{"open": [2.0, 1.0], "high": [2.0, 1.0], "low": [2.0, 1.0],
+                                          "close": [2.0, 1.0], "volume": [200, 100]}]}}
+        df = yf.utils.parse_quotes(data)
+        self.assertTrue(df.index.is_monotonic_increasing)
+        self.assertEqual(list(df["Close"]), [1.0, 2.0])
+        self.assertEqual(list(df["Volume"]), [100, 200])
+
+
+class TestResampleHistory(unittest.TestCase):
+    def test_sessionAnchored(self):
+        import pandas as pd
+        import numpy as np
+        tz = 'America/New_York'
+        idx = pd.date_range('2024-01-02 09:30', '2024-01-02 15:45', freq='15min', tz=tz)
+        n = len(idx)
+        df = pd.DataFrame({"Open": np.arange(n) * 1.0, "High": np.arange(n) + 1.0, "Low": np.arange(n) - 1.0,
+                           "Close": np.arange(n) + 0.5, "Volume": np.ones(n, dtype=np.int64)}, index=idx)
+        tps = pd.DataFrame({"start": [idx[0]], "end": [idx[0] + pd.Timedelta(hours=6, minutes=30)]},
+                           index=pd.DatetimeIndex([pd.Timestamp('2024-01-02', tz=tz)]))
+
+        df_1h = yf.utils.resample_history(df, "1h", tps)
+        self.assertEqual(df_1h.index[0], pd.Timestamp('2024-01-02 09:30', tz=tz))
+        self.assertEqual(df_1h.index[-1], pd.Timestamp('2024-01-02 15:30', tz=tz))
+        self.assertEqual(list(df_1h.iloc[0]), [0.0, 4.0, -1.0, 3.5, 4])
+
+        df_1d = yf.utils.resample_history(df, "1d", tps)
+        self.assertEqual(df_1d.shape[0], 1)
+        self.assertEqual(df_1d["Volume"].iloc[0], n)
+        self.assertEqual(df_1d["Close"].iloc[0], df["Close"].iloc[-1])
+
+
+class TestSafeMerge(unittest.TestCase):
+    def test_outOfRangeEvents(self):
+        import pandas as pd
+        tz = 'America/New_York'
+        idx = pd.bdate_range('2023-01-02', '2023-01-31', tz=tz)
+        df = pd.DataFrame({"Open": 1.0, "High": 1.0, "Low": 1.0, "Close": 1.0, "Adj Close": 1.0, "Volume": 1}, index=idx)
+        dts = pd.DatetimeIndex([pd.Timestamp('2022-12-15', tz=tz), idx[3], pd.Timestamp('2023-02-15', tz=tz)])
+        divs = pd.DataFrame({"Dividends": [0.1, 0.2, 0.3]}, index=dts)
+
+        # 1d: out-of-range events get their own rows of NaN prices
+        df_merged = yf.utils.safe_merge_dfs(df, divs, '1d')
+        self.assertEqual(df_merged.shape[0], len(idx) + 2)
+        self.assertTrue(df_merged.loc[dts[[0, 2]], "Close"].isna().all())
+        self.assertEqual(df_merged["Dividends"].sum(), 0.6)
+
+        # Intraday: out-of-range events discarded
+        idx_30m = pd.DatetimeIndex([d + pd.Timedelta(minutes=m) for d in idx for m in (600, 630, 660)])
+        df_30m = pd.DataFrame({"Close": 1.0, "Volume": 1}, index=idx_30m)
+        df_merged = yf.utils.safe_merge_dfs(df_30m, divs, '30m')
+        self.assertEqual(df_merged.shape[0], len(idx_30m))
+        self.assertEqual(df_merged["Dividends"].sum(), 0.2)
+        self.assertEqual(df_merged["Dividends"].first_valid_index(), idx[3] + pd.Timedelta(hours=10))
+
+
+class TestTradingSessions(unittest.TestCase):
+    def test_mapAndFilter(self):
+        import pandas as pd
+        tz = 'Europe/London'
+        days = pd.DatetimeIndex([pd.Timestamp('2024-01-02', tz=tz), pd.Timestamp('2024-01-03', tz=tz)], name="Date")
+        tps = pd.DataFrame({"start": days + pd.Timedelta(hours=8), "end": days + pd.Timedelta(hours=16, minutes=30)}, index=days)
+        idx = pd.DatetimeIndex([pd.Timestamp(dt, tz=tz) for dt in
+                                ['2024-01-02 07:00', '2024-01-02 08:00', '2024-01-02 16:30', '2024-01-03 12:00', '2024-01-04 12:00']])
+        quotes = pd.DataFrame({"Close": range(len(idx))}, index=idx)
+
+        # Matched on exchange-local date, -1 = no session that day
+        self.assertEqual(list(yf.utils.map_trading_sessions(idx, tps)), [0, 0, 0, 1, -1])
+        self.assertEqual(list(yf.utils.map_trading_sessions(idx, tps.iloc[::-1])), [1, 1, 1, 0, -1])
+
+        # Bars outside regular hours dropped, bars without session kept
+        df = yf.utils.fix_Yahoo_returning_prepost_unrequested(quotes, "1m", tps)
+        self.assertEqual(list(df["Close"]), [1, 3, 4])
+
+
+class TestCredentials(unittest.TestCase):
+    def test_invalidateOnce(self):
+        import threading
+        # Fresh instance, bypassing the singleton
+        data = object.__new__(yf.data.YfData)
+        data.__init__()
+        data._credentials_generation = 1
+        data._credentials = yf.data._Credentials(None, 'crumb', 'basic', 1)
+
+        toggles = []
+        set_cookie_strategy = data._set_cookie_strategy
+        data._set_cookie_strategy = lambda *args, **kwargs: (toggles.append(args), set_cookie_strategy(*args, **kwargs))
+
+        # Many threads report same rejected generation = one strategy switch
+        barrier = threading.Barrier(8)
+
+        def _invalidate():
+            barrier.wait()
+            data._invalidate_credentials(1)
+        threads = [threading.Thread(target=_invalidate) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(toggles), 1)
+        self.assertIsNone(data._credentials)
+
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        import threading
+        # Fresh instance, bypassing the singleton
+        self.data = object.__new__(yf.data.YfData)
+        self.data.__init__()
+        self.data._get_credentials = lambda proxy, timeout: yf.data._Credentials(None, 'crumb', 'basic', 1)
+        self.calls = []
+        self.release = threading.Event()
+
+    def _get_concurrently(self, n=8):
+        import threading
+        import time
+        results = [None] * n
+
+        def _get(i):
+            try:
+                results[i] = self.data.get('https://query2.finance.yahoo.com/v8/finance/chart/MSFT', params={"range": "1d"})
+            except Exception as e:
+                results[i] = e
+        threads = [threading.Thread(target=_get, args=(i,)) for i in range(n)]
+        for t in threads:
+            t.start()
+        # Leader blocks in _send(), give followers time to join it
+        while not self.calls:
+            time.sleep(0.01)
+        time.sleep(0.1)
+        self.release.set()
+        for t in threads:
+            t.join()
+        return results
+
+    def test_oneRequest(self):
+        from unittest import mock
+        response = mock.Mock(status_code=200, content=b'{}')
+
+        def _send(request_args):
+            self.calls.append(request_args)
+            self.release.wait()
+            return response
+        self.data._send = _send
+
+        results = self._get_concurrently()
+        self.assertEqual(len(self.calls), 1)
+        self.assertTrue(all(r is response for r in results))
+
+    def test_leaderExceptionShared(self):
+        def _send(request_args):
+            self.calls.append(request_args)
+            self.release.wait()
+            raise ConnectionError("boom")
+        self.data._send = _send
+
+        results = self._get_concurrently()
+        self.assertEqual(len(self.calls), 1)
+        self.assertTrue(all(isinstance(r, ConnectionError) for r in results))
+
+
 def suite():
     suite = unittest.TestSuite()
     suite.addTest(TestCache('Test cache'))
     suite.addTest(TestCacheNoPermission('Test cache no permission'))
+    suite.addTest(TestResponseCache('Test response cache'))
+    suite.addTest(TestChartCache('Test chart cache'))
+    suite.addTest(TestPriceStore('Test price store'))
+    suite.addTest(TestRateLimiter('Test rate limiter'))
+    suite.addTest(TestCredentials('Test credentials'))
+    suite.addTest(TestSingleFlight('Test single flight'))
+    suite.addTest(TestParseQuotes('Test parse quotes'))
+    suite.addTest(TestResampleHistory('Test resample history'))
+    suite.addTest(TestSafeMerge('Test safe merge'))
+    suite.addTest(TestTradingSessions('Test trading sessions'))
     return suite
 
 
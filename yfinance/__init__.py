@@ -22,9 +22,11 @@
 from . import version
 from .ticker import Ticker
 from .tickers import Tickers
-from .multi import download
+from .multi import download, download_iter
+from .aio import async_download, AsyncTicker
 from .utils import enable_debug_mode
 from .cache import set_tz_cache_location
+from .data import set_rate_limit
 
 __version__ = version.version
 __author__ = "Ran Aroussi"
@@ -44,4 +46,4 @@ def pdr_override():
         pass
 
 
-__all__ = ['download', 'Ticker', 'Tickers', 'pdr_override', 'enable_debug_mode', 'set_tz_cache_location']
+__all__ = ['download', 'download_iter', 'async_download', 'Ticker', 'AsyncTicker', 'Tickers', 'pdr_override', 'enable_debug_mode', 'set_tz_cache_location', 'set_rate_limit']
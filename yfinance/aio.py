@@ -0,0 +1,301 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# yfinance - market data downloader
+# https://github.com/ranaroussi/yfinance
+#
+# Copyright 2017-2019 Ran Aroussi
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+asyncio alternative to download(): one event loop keeps many chart
+requests in flight, instead of one thread per ticker.
+
+Requires the optional package 'aiohttp'.
+"""
+
+import asyncio
+import logging
+import traceback
+
+from . import Ticker, utils, cache, multi, shared
+from .data import YfData
+from .exceptions import YFRateLimitError
+
+try:
+    import aiohttp as _aiohttp
+except ImportError:
+    _aiohttp = None
+
+
+def _require_aiohttp():
+    if _aiohttp is None:
+        raise ImportError("yfinance async download requires 'aiohttp', install with: pip install aiohttp")
+
+
+async def _run_blocking(fn, *args):
+    # sqlite cache access and other blocking calls, kept off the event loop
+    return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+
+class _AsyncFetcher:
+    """
+    Fetch Yahoo JSON through one aiohttp session, bounded by a semaphore.
+    Cookie & crumb are borrowed from the (synchronous) YfData singleton.
+    """
+
+    def __init__(self, client, concurrency, session=None):
+        self._client = client
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._data = YfData(session=session)
+        self._creds = None
+        self._creds_lock = asyncio.Lock()
+
+    async def _get_credentials(self, stale_generation=None):
+        loop = asyncio.get_running_loop()
+        async with self._creds_lock:
+            if self._creds is not None and self._creds[2] == stale_generation:
+                # Rejected by Yahoo. Other coroutines that used the same
+                # generation find it already replaced, so refresh happens once.
+                self._creds = None
+                await loop.run_in_executor(None, self._data._invalidate_credentials, stale_generation)
+            if self._creds is None:
+                # Fetching cookie & crumb is blocking, so keep it off the event loop
+                credentials = await loop.run_in_executor(None, self._data._get_credentials)
+                if credentials.strategy == 'basic' and credentials.cookie is not None:
+                    cookies = {credentials.cookie.name: credentials.cookie.value}
+                else:
+                    cookies = {c.name: c.value for c in self._data._session.cookies}
+                self._creds = (credentials.crumb, cookies, credentials.generation)
+            return self._creds
+
+    async def _send(self, url, **kwargs):
+        # GET through YfData's rate limiter, same backoff as YfData._send()
+        limiter = self._data._rate_limiter
+        for attempt in range(self._data.max_retries + 1):
+            wait = limiter.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            async with self._client.get(url, **kwargs) as response:
+                status = response.status
+                text = await response.text()
+                retry_after = response.headers.get('Retry-After') if status == 429 else None
+            if status not in self._data._retry_statuses:
+                limiter.on_success()
+                return status, text
+
+            if status == 429:
+                retry_after = limiter.parse_retry_after(retry_after)
+                limiter.on_throttled(retry_after)
+            if attempt == self._data.max_retries:
+                break
+            await asyncio.sleep(retry_after if retry_after is not None else limiter.backoff(attempt))
+        return status, text
+
+    async def get_json(self, url, params=None, proxy=None, timeout=30):
+        # aiohttp only accepts str/int/float query values
+        params = {k: str(v) if isinstance(v, bool) else v for k, v in (params or {}).items()}
+        if isinstance(proxy, dict):
+            proxy = proxy.get("https")
+
+        async with self._semaphore:
+            generation = None
+            for attempt in range(2):
+                crumb, cookies, generation = await self._get_credentials(stale_generation=generation)
+                request_params = dict(params)
+                if crumb is not None:
+                    request_params['crumb'] = crumb
+                status, text = await self._send(url, params=request_params, cookies=cookies,
+                                                headers=self._data.user_agent_headers, proxy=proxy,
+                                                timeout=_aiohttp.ClientTimeout(total=timeout))
+                if status not in (401, 403):
+                    break
+
+        if "Will be right back" in text:
+            raise RuntimeError("*** YAHOO! FINANCE IS CURRENTLY DOWN! ***\n"
+                               "Our engineers are working quickly to resolve "
+                               "the issue. Thank you for your patience.")
+        return utils.json_loads(text)
+
+
+class AsyncTicker:
+    """
+    Async counterpart of Ticker.history(). Request construction and
+    post-processing are shared with the wrapped Ticker, only the
+    network fetch is async.
+    """
+
+    def __init__(self, ticker, session=None, fetcher=None):
+        self._tkr = Ticker(ticker, session=session)
+        self.ticker = self._tkr.ticker
+        self._session = session
+        self._fetcher = fetcher
+
+    def __repr__(self):
+        return f'yfinance.AsyncTicker object <{self.ticker}>'
+
+    async def _get_ticker_tz(self, fetcher, proxy, timeout):
+        if self._tkr._tz is not None:
+            return self._tkr._tz
+        c = await _run_blocking(cache.get_tz_cache)
+        tz = await _run_blocking(c.lookup, self.ticker)
+        if tz and not utils.is_valid_timezone(tz):
+            await _run_blocking(c.store, self.ticker, None)
+            tz = None
+
+        if tz is None:
+            url = f"{self._tkr._base_url}/v8/finance/chart/{self.ticker}"
+            try:
+                data = await fetcher.get_json(url, params={"range": "1d", "interval": "1d"}, proxy=proxy, timeout=timeout)
+                tz = data["chart"]["result"][0]["meta"]["exchangeTimezoneName"]
+            except Exception as e:
+                utils.get_yf_logger().debug(f"Failed to get ticker '{self.ticker}' timezone, reason: {e}")
+                tz = None
+            if utils.is_valid_timezone(tz):
+                await _run_blocking(c.store, self.ticker, tz)
+            else:
+                tz = None
+
+        self._tkr._tz = tz
+        return tz
+
+    async def _fetch_chart(self, fetcher, request, proxy, timeout):
+        # Chart JSON through chart cache, None if fetch failed
+        chart_cache_key = self._tkr._chart_cache_key(request)
+        data = None
+        if chart_cache_key is not None:
+            data = await _run_blocking(cache.get_chart_cache().lookup, chart_cache_key)
+        if data is None:
+            try:
+                data = await fetcher.get_json(request["url"], params=request["params"], proxy=proxy, timeout=timeout)
+            except (asyncio.CancelledError, YFRateLimitError):
+                raise
+            except Exception:
+                data = None
+            else:
+                if chart_cache_key is not None and self._tkr._is_valid_chart_data(data):
+                    await _run_blocking(cache.get_chart_cache().store, chart_cache_key, data)
+        return data
+
+    async def history(self, period="1mo", interval="1d",
+                      start=None, end=None, prepost=False, actions=True,
+                      auto_adjust=True, back_adjust=False, repair=False, keepna=False,
+                      proxy=None, rounding=False, timeout=10,
+                      raise_errors=False, dtype_profile='default'):
+        """
+        Same arguments and result as Ticker.history(), but awaitable.
+        """
+        logger = utils.get_yf_logger()
+        utils.check_dtype_profile(dtype_profile)
+
+        own_client = None
+        fetcher = self._fetcher
+        if fetcher is None:
+            _require_aiohttp()
+            own_client = _aiohttp.ClientSession()
+            fetcher = _AsyncFetcher(own_client, concurrency=1, session=self._session)
+        try:
+            tz = await self._get_ticker_tz(fetcher, proxy, timeout)
+            request = self._tkr._build_history_request(period, interval, start, end, prepost, tz)
+            if request is None:
+                err_msg = "No timezone found, symbol may be delisted"
+                if raise_errors:
+                    raise Exception(f'{self.ticker}: {err_msg}')
+                logger.error(f'{self.ticker}: {err_msg}')
+                return utils.empty_df()
+
+            # Long intraday ranges are split into windows Yahoo accepts, like history()
+            windows = self._tkr._split_history_request(request)
+            datas = await asyncio.gather(*[self._fetch_chart(fetcher, w, proxy, timeout) for w in windows])
+            data = datas[0] if len(datas) == 1 else self._tkr._merge_chart_data(datas)
+        finally:
+            if own_client is not None:
+                await own_client.close()
+
+        process_args = dict(actions=actions, auto_adjust=auto_adjust, back_adjust=back_adjust,
+                            repair=repair, keepna=keepna, rounding=rounding, raise_errors=raise_errors,
+                            dtype_profile=dtype_profile)
+        if repair:
+            # Price repair fetches finer-grained data synchronously, keep that off the event loop
+            loop = asyncio.get_running_loop()
+            df, _, _ = await loop.run_in_executor(
+                None, lambda: self._tkr._process_history_data(data, request, **process_args))
+            return df
+        df, _, _ = self._tkr._process_history_data(data, request, **process_args)
+        return df
+
+
+async def async_download(tickers, start=None, end=None, actions=False, ignore_tz=None,
+                         group_by='column', auto_adjust=False, back_adjust=False, repair=False, keepna=False,
+                         progress=True, period="max", interval="1d", prepost=False,
+                         proxy=None, rounding=False, timeout=10, session=None, concurrency=100,
+                         layout='wide', dtype_profile=None):
+    """Download yahoo tickers using asyncio. Must be awaited.
+    :Parameters:
+        Same as download(), except 'threads' is replaced by:
+        concurrency : int
+            Maximum number of requests in flight. Default is 100
+        session: None or Session
+            Optional. requests Session used to obtain cookie & crumb
+    """
+    _require_aiohttp()
+    logger = utils.get_yf_logger()
+    dtype_profile = multi._layout_dtype_profile(layout, dtype_profile)
+
+    if logger.isEnabledFor(logging.DEBUG) and progress:
+        # Disable progress bar, interferes with display of log messages
+        progress = False
+
+    if ignore_tz is None:
+        # Set default value depending on interval
+        ignore_tz = interval[1:] not in ['m', 'h']
+
+    # ISIN lookups are blocking requests
+    tickers, isins = await _run_blocking(multi._normalise_tickers, tickers, proxy, session)
+
+    results = shared.DownloadResults()
+    results.isins = isins
+    if progress:
+        results.progress_bar = utils.ProgressBar(len(tickers), 'completed')
+
+    async with _aiohttp.ClientSession() as client:
+        fetcher = _AsyncFetcher(client, concurrency=concurrency, session=session)
+
+        async def _download_one(ticker):
+            try:
+                results.dfs[ticker] = await AsyncTicker(ticker, session=session, fetcher=fetcher).history(
+                    period=period, interval=interval,
+                    start=start, end=end, prepost=prepost,
+                    actions=actions, auto_adjust=auto_adjust,
+                    back_adjust=back_adjust, repair=repair, proxy=proxy,
+                    rounding=rounding, keepna=keepna, timeout=timeout,
+                    raise_errors=True, dtype_profile=dtype_profile)
+            except Exception as e:
+                results.dfs[ticker] = utils.empty_df()
+                results.errors[ticker] = repr(e)
+                results.tracebacks[ticker] = traceback.format_exc()
+            if results.progress_bar is not None:
+                results.progress_bar.animate()
+
+        await asyncio.gather(*[_download_one(t) for t in tickers])
+
+    if results.progress_bar is not None:
+        results.progress_bar.completed()
+
+    multi._log_errors(results.errors, results.tracebacks)
+
+    # gather() completes in any order, keep columns in ticker order
+    dfs = {t: results.dfs[t] for t in tickers}
+    return multi._combine_dfs(dfs, tickers, results.isins, ignore_tz, group_by, layout)
@@ -21,7 +21,10 @@
 
 from __future__ import print_function
 
+import concurrent.futures as _futures
+import copy
 import datetime as _datetime
+from collections import OrderedDict as _OrderedDict
 from io import StringIO
 import json as _json
 import logging
@@ -35,8 +38,9 @@ import numpy as np
 import pandas as pd
 import requests
 
-from . import shared, utils, cache
+from . import utils, cache, const
 from .data import YfData
+from .exceptions import YFRateLimitError
 from .scrapers.analysis import Analysis
 from .scrapers.fundamentals import Fundamentals
 from .scrapers.holders import Holders
@@ -50,6 +54,9 @@ class TickerBase:
         self.ticker = ticker.upper()
         self.session = session
         self._history = None
+        self._history_factor = None
+        self._history_memo = _OrderedDict()
+        self._actions = None
         self._history_metadata = None
         self._history_metadata_formatted = False
         self._base_url = _BASE_URL_
@@ -86,7 +93,7 @@ class TickerBase:
                 auto_adjust=True, back_adjust=False, repair=False, keepna=False,
                 proxy=None, rounding=False, timeout=10,
                 debug=None,  # deprecated
-                raise_errors=False) -> pd.DataFrame:
+                raise_errors=False, dtype_profile='default', previous=None, store=False) -> pd.DataFrame:
         """
         :Parameters:
             period : str
@@ -94,7 +101,8 @@ class TickerBase:
                 Either Use period parameter or use start and end
             interval : str
                 Valid intervals: 1m,2m,5m,15m,30m,60m,90m,1h,1d,5d,1wk,1mo,3mo
-                Intraday data cannot extend last 60 days
+                Intraday data cannot extend last 60 days (1m: 30 days).
+                1m ranges longer than 7 days are fetched in parallel 7-day windows
             start: str
                 Download start date string (YYYY-MM-DD) or _datetime, inclusive.
                 Default is 99 years ago
@@ -130,9 +138,25 @@ class TickerBase:
                 DEPRECATED, will be removed in future version
             raise_errors: bool
                 If True, then raise errors as Exceptions instead of logging.
+            dtype_profile: str
+                'default': float64 prices.
+                'compact': float32 prices, and Dividends/Stock Splits/Capital Gains
+                as sparse columns (mostly zero). Halves memory of long intraday data.
+            previous: DataFrame
+                Optional. Frame returned by an earlier call with same arguments.
+                Only bars since its end are fetched and appended. Falls back to
+                full fetch if Yahoo has since revised overlapping prices or a new
+                split/dividend means older prices need re-adjusting.
+            store: bool
+                Read & write prices in local store under cache folder (see
+                set_tz_cache_location). Ranges already stored are read from
+                disk, else only the missing bars are fetched and saved.
+                'period' is converted to a start date. Default is False
         """
         logger = utils.get_yf_logger()
 
+        utils.check_dtype_profile(dtype_profile)
+
         if debug is not None:
             if debug:
                 utils.print_once(f"yfinance: Ticker.history(debug={debug}) argument is deprecated and will be removed in future version. Do this instead: logging.getLogger('yfinance').setLevel(logging.ERROR)")
@@ -141,21 +165,387 @@ class TickerBase:
                 utils.print_once(f"yfinance: Ticker.history(debug={debug}) argument is deprecated and will be removed in future version. Do this instead to suppress error messages: logging.getLogger('yfinance').setLevel(logging.CRITICAL)")
                 logger.setLevel(logging.CRITICAL)
 
+        if store:
+            if previous is not None:
+                raise ValueError("history(): pass 'previous' or 'store', not both")
+            return self._history_store(period=period, interval=interval, start=start, end=end,
+                                       prepost=prepost, actions=actions, auto_adjust=auto_adjust,
+                                       back_adjust=back_adjust, repair=repair, keepna=keepna, proxy=proxy,
+                                       rounding=rounding, timeout=timeout, raise_errors=raise_errors,
+                                       dtype_profile=dtype_profile)
+
+        if previous is not None:
+            return self._history_incremental(previous, period=period, interval=interval,
+                                             start=start, end=end, prepost=prepost, actions=actions,
+                                             auto_adjust=auto_adjust, back_adjust=back_adjust,
+                                             repair=repair, keepna=keepna, proxy=proxy,
+                                             rounding=rounding, timeout=timeout,
+                                             raise_errors=raise_errors, dtype_profile=dtype_profile)
+
+        tz = self._get_ticker_tz(proxy, timeout)
+        request = self._build_history_request(period, interval, start, end, prepost, tz)
+        if request is None:
+            # Every valid ticker has a timezone. Missing = problem
+            err_msg = "No timezone found, symbol may be delisted"
+            if raise_errors:
+                raise Exception(f'{self.ticker}: {err_msg}')
+            else:
+                logger.error(f'{self.ticker}: {err_msg}')
+            return utils.empty_df()
+
+        memo_key = (interval, prepost, bool(repair), dtype_profile)
+        entry = self._memo_lookup(memo_key, request)
+        if entry is not None:
+            logger.debug(f'{self.ticker}: reusing {interval} prices fetched earlier')
+            self._history_metadata = entry["metadata"]
+            return self._finalise_history(self._memo_slice(entry, request), actions=actions,
+                                          auto_adjust=auto_adjust, back_adjust=back_adjust,
+                                          keepna=keepna, rounding=rounding,
+                                          price_hint=entry["metadata"].get("priceHint", 2),
+                                          raise_errors=raise_errors, dtype_profile=dtype_profile)
+
+        windows = self._split_history_request(request)
+        if len(windows) > 1:
+            data = self._fetch_history_windows(windows, proxy, timeout)
+        else:
+            data = self._fetch_history_data(request, proxy, timeout)
+
+        df, raw, metadata = self._process_history_data(data, request, actions=actions,
+                                                       auto_adjust=auto_adjust, back_adjust=back_adjust,
+                                                       repair=repair, keepna=keepna, rounding=rounding,
+                                                       raise_errors=raise_errors, dtype_profile=dtype_profile)
+        if raw is not None:
+            # Processed OK
+            self._memo_store(memo_key, request, raw, metadata)
+        return df
+
+    # Processed prices of recent history() calls are kept, to serve repeat
+    # calls & sub-ranges. Bounded by bytes not count, as one intraday frame
+    # can outweigh years of daily. Latest raw frame is also what
+    # adjust_history() keeps, so it counts once and is never evicted.
+    # Ranges ending now expire quickly, closed ranges don't.
+    _memo_max_bytes = 16 * 1024 * 1024
+    _memo_ttl = 60
+    _memo_max_age = 24 * 60 * 60
+
+    def _memo_store(self, memo_key, request, raw, metadata):
+        params = request["params"]
+        entry = {"raw": raw, "metadata": metadata,
+                 "range": params.get("range"), "start": params.get("period1"), "end": params.get("period2"),
+                 "closed": request["cacheable"], "time": _time.time(),
+                 "nbytes": int(raw.memory_usage(index=True).sum())}
+        key = (memo_key, entry["range"], entry["start"], entry["end"])
+        self._history_memo.pop(key, None)
+        self._history_memo[key] = entry
+        nbytes = sum(e["nbytes"] for e in self._history_memo.values())
+        while nbytes > self._memo_max_bytes and len(self._history_memo) > 1:
+            nbytes -= self._history_memo.popitem(last=False)[1]["nbytes"]
+
+    def _memo_lookup(self, memo_key, request, max_age=None):
+        # Find memo entry with data for whole request
+        params = request["params"]
+        now = _time.time()
+        for (key, _, _, _), entry in reversed(self._history_memo.items()):
+            if key != memo_key:
+                continue
+            age = max_age if max_age is not None else self._memo_max_age if entry["closed"] else self._memo_ttl
+            if now - entry["time"] > age:
+                continue
+            if "range" in params:
+                # Can't tell exactly what range Yahoo returns for a period, so only reuse same period
+                if entry["range"] == params["range"]:
+                    return entry
+                continue
+            if entry["start"] is None:
+                continue
+            interval = memo_key[0]
+            if interval != "1d" and interval[-1] not in ("m", "h") and entry["start"] != params["period1"]:
+                # Weekly/monthly bars are aligned to start, only reuse same start
+                continue
+            if entry["start"] <= params["period1"] and \
+                    (params["period2"] <= entry["end"] or not (request["cacheable"] or entry["closed"])):
+                return entry
+        return None
+
+    @staticmethod
+    def _memo_slice(entry, request):
+        raw = entry["raw"]
+        params = request["params"]
+        if "period1" in params and raw.shape[0] > 0:
+            i0, i1 = raw.index.searchsorted(pd.to_datetime([params["period1"], params["period2"]], unit='s', utc=True))
+            raw = raw.iloc[i0:i1]
+        # _finalise_history() assigns columns, don't let it touch the memo
+        return raw.copy(deep=False)
+
+    def history_intervals(self, intervals, **kwargs) -> dict:
+        """
+        Price history at several intervals from one fetch: the finest
+        interval is fetched, coarser ones are aggregated from it locally,
+        anchored to the exchange's trading sessions.
+        :Parameters:
+            intervals : list
+                E.g. ["5m", "15m", "1h", "1d"]. Coarser intervals must be
+                multiples of the finest, and only cover its date range.
+                Intraday prices are not dividend-adjusted, nor are
+                daily bars derived from them.
+            Other arguments as history(), except 'interval'
+        :Returns:
+            dict of interval -> DataFrame
+        """
+        order = ["1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h", "1d", "1wk", "1mo", "3mo"]
+        for interval in intervals:
+            if interval not in order:
+                raise ValueError(f"history_intervals() doesn't support interval '{interval}'")
+        finest = min(intervals, key=order.index)
+        if finest[-1] in ('m', 'h'):
+            td_finest = pd.Timedelta(finest.replace('m', 'min'))
+            for interval in intervals:
+                if interval[-1] in ('m', 'h') and pd.Timedelta(interval.replace('m', 'min')) % td_finest:
+                    raise ValueError(f"Interval '{interval}' is not a multiple of '{finest}'")
+
+        df = self.history(interval=finest, **kwargs)
+        tps = self._get_trading_periods()
+        return {interval: df if interval == finest else utils.resample_history(df, interval, tps)
+                for interval in intervals}
+
+    # Bars of previous frame re-fetched, to detect Yahoo revising older prices
+    _incremental_overlap = 3
+
+    def _history_incremental(self, previous, period, interval, start, end, actions,
+                             auto_adjust, back_adjust, **kwargs):
+        # history(previous=df): fetch from last few bars of 'previous', verify
+        # they still match, and append new bars. Else fetch in full.
+        logger = utils.get_yf_logger()
+
+        def _full(reason):
+            logger.debug(f'{self.ticker}: incremental history not possible ({reason}), fetching in full')
+            return self.history(period=period, interval=interval, start=start, end=end, actions=actions,
+                                auto_adjust=auto_adjust, back_adjust=back_adjust, **kwargs)
+
+        if not isinstance(previous, pd.DataFrame) or previous.shape[0] == 0 \
+                or not isinstance(previous.index, pd.DatetimeIndex):
+            return _full("no previous data")
+
+        # Always fetch actions, to detect new ones
+        n_overlap = min(previous.shape[0], self._incremental_overlap)
+        delta = self.history(start=previous.index[-n_overlap], end=end, interval=interval, actions=True,
+                             auto_adjust=auto_adjust, back_adjust=back_adjust, **kwargs)
+        if delta.shape[0] == 0:
+            # Nothing new (errors were logged/raised by history())
+            return previous
+        if previous.index.tz is None and delta.index.tz is not None:
+            # e.g. previous came from download(ignore_tz=True)
+            delta.index = delta.index.tz_localize(None)
+
+        # Compare overlap. Last bar of 'previous' may have been live, so exclude it.
+        overlap = previous.index.intersection(delta.index)
+        overlap = overlap[overlap < previous.index[-1]]
+        if n_overlap > 1 and len(overlap) == 0:
+            return _full("no overlap with previous")
+        price_cols = [c for c in ["Open", "High", "Low", "Close", "Adj Close"]
+                      if c in previous.columns and c in delta.columns]
+        if len(overlap) > 0:
+            prev_px = previous.loc[overlap, price_cols].to_numpy(dtype=float)
+            new_px = delta.loc[overlap, price_cols].to_numpy(dtype=float)
+            if not np.allclose(prev_px, new_px, rtol=1e-5, equal_nan=True):
+                return _full("overlapping prices changed")
+
+        # New split = all older prices rescaled. New dividend = older adjusted prices change.
+        new_rows = delta.index[delta.index > overlap[-1]] if len(overlap) > 0 else delta.index
+        adjusted = auto_adjust or back_adjust or "Adj Close" in previous.columns
+        for c in ["Stock Splits", "Dividends", "Capital Gains"]:
+            if c not in delta.columns or (c != "Stock Splits" and not adjusted):
+                continue
+            new_vals = delta.loc[new_rows, c]
+            if c in previous.columns:
+                known = previous[c].reindex(new_rows).fillna(0).to_numpy()
+            else:
+                known = 0
+            if ((new_vals != 0) & (new_vals != known)).any():
+                return _full(f"new {c}")
+
+        if not actions:
+            delta = delta.drop(columns=["Dividends", "Stock Splits", "Capital Gains"], errors='ignore')
+        return pd.concat([previous[previous.index < delta.index[0]], delta])
+
+    def _history_store(self, period, interval, start, end, prepost, actions, auto_adjust, back_adjust,
+                       repair, keepna, proxy, rounding, timeout, raise_errors, dtype_profile):
+        # history(store=True): serve from local price store, fetching only what it lacks.
+        # Store keeps raw prices + actions, adjusting etc. is done on the way out.
+        logger = utils.get_yf_logger()
+
+        tz = self._get_ticker_tz(proxy, timeout)
+        if tz is None:
+            # Let history() report the error
+            return self.history(period=period, interval=interval, start=start, end=end, prepost=prepost,
+                                actions=actions, auto_adjust=auto_adjust, back_adjust=back_adjust,
+                                repair=repair, keepna=keepna, proxy=proxy, rounding=rounding,
+                                timeout=timeout, raise_errors=raise_errors, dtype_profile=dtype_profile)
+
+        end = int(_time.time()) if end is None else utils._parse_user_dt(end, tz)
+        if start is not None:
+            start = utils._parse_user_dt(start, tz)
+        elif interval == "1m" and (period is None or period.lower() == "max"):
+            start = end - 604800  # Subtract 7 days
+        else:
+            start = utils._period_to_start(period, end, tz)
+
+        price_store = cache.get_price_store()
+        key = price_store.make_key(interval, prepost, repair)
+        meta = price_store.read_meta(self.ticker, key)
+        # A new dividend or split re-adjusts all earlier prices. Compare with
+        # actions known when stored, cheap as _get_actions() fetches no prices.
+        # Still a request, so only re-checked every 'events_max_age'.
+        events = None
+        if meta is not None and price_store.events_due(meta):
+            events = self._events_signature(proxy)
+        stale = price_store.is_stale(meta, events)
+        if stale:
+            logger.debug(f'{self.ticker}: stored {interval} prices are stale, refetching')
+        elif events is not None:
+            price_store.set_events_checked(self.ticker, key)
+        df = None
+        if not stale and price_store.covers(meta, start, end):
+            logger.debug(f'{self.ticker}: reading {interval} prices from local store')
+            df = price_store.read(self.ticker, key, start, end)
+            if df is None:
+                # Column files missing or corrupt
+                logger.debug(f'{self.ticker}: stored {interval} prices unreadable, refetching')
+                price_store.drop(self.ticker, key)
+                meta = None
+            else:
+                price_hint = meta["price_hint"]
+        if df is None:
+            previous = None
+            if not stale and meta is not None and meta["start"] <= start <= meta["end"]:
+                # Only fetch bars after stored range
+                previous = price_store.read(self.ticker, key, start, end)
+            df = self.history(start=start, end=end, interval=interval, prepost=prepost, actions=True,
+                              auto_adjust=False, back_adjust=False, repair=repair, keepna=True,
+                              proxy=proxy, timeout=timeout, raise_errors=raise_errors, previous=previous)
+            if df.shape[0] == 0:
+                return df
+            price_hint = self._history_metadata.get("priceHint")
+            # Last bar of open range may still be forming, don't mark it stored
+            covered_end = end
+            if end + _datetime.timedelta(minutes=30).total_seconds() > _time.time():
+                covered_end = min(end, int(df.index[-1].timestamp()))
+            if events is None and meta is not None and not stale:
+                # Not due a re-check = stored events still current
+                events = meta.get("events")
+            if events is None:
+                events = self._events_signature(proxy)
+            price_store.write(self.ticker, key, df, tz, start, covered_end, price_hint, events)
+
+        return self._finalise_history(df, actions=actions, auto_adjust=auto_adjust, back_adjust=back_adjust,
+                                      keepna=keepna, rounding=rounding, price_hint=price_hint,
+                                      raise_errors=raise_errors, dtype_profile=dtype_profile)
+
+    def _events_signature(self, proxy=None):
+        # (count, last timestamp) of dividends, splits & capital gains, None if unknown
+        actions = self._get_actions(proxy)
+        if actions is None:
+            return None
+        return int(actions.shape[0]), int(actions.index[-1].timestamp()) if actions.shape[0] > 0 else 0
+
+    def _get_trading_periods(self):
+        # Sessions of last history() fetch as DataFrame, None if Yahoo didn't send
+        if not isinstance(self._history_metadata, dict):
+            # Fetch failed or returned no metadata
+            return None
+        tps = self._history_metadata.get("tradingPeriods")
+        if tps is not None and not isinstance(tps, pd.DataFrame):
+            try:
+                self._history_metadata = utils.format_history_metadata(self._history_metadata, tradingPeriodsOnly=True)
+            except Exception:
+                return None
+            tps = self._history_metadata["tradingPeriods"]
+        return tps if isinstance(tps, pd.DataFrame) else None
+
+    def _finalise_history(self, df, actions, auto_adjust, back_adjust, keepna, rounding, price_hint,
+                          raise_errors, dtype_profile, keep_raw=True):
+        # Raw prices + actions -> what history() returns
+        logger = utils.get_yf_logger()
+
+        df['Volume'] = df['Volume'].fillna(0).astype(np.int64)
+        raw = df
+        if keep_raw:
+            # Keep unadjusted prices & adjustment factor, so adjust_history()
+            # can switch adjustment without refetching. Never handed out, so no copy.
+            self._history = raw
+            self._history_factor = utils.adjustment_factor(raw) if "Adj Close" in raw.columns else None
+
+        # Auto/back adjust
+        try:
+            if auto_adjust:
+                df = utils.auto_adjust(df, self._history_factor)
+            elif back_adjust:
+                df = utils.back_adjust(df, self._history_factor)
+        except Exception as e:
+            if auto_adjust:
+                err_msg = "auto_adjust failed with %s" % e
+            else:
+                err_msg = "back_adjust failed with %s" % e
+            if raise_errors:
+                raise Exception('%s: %s' % (self.ticker, err_msg))
+            else:
+                logger.error('%s: %s' % (self.ticker, err_msg))
+
+        if rounding:
+            df = np.round(df, price_hint)
+
+        # missing rows cleanup
+        if not actions:
+            df = df.drop(columns=["Dividends", "Stock Splits", "Capital Gains"], errors='ignore')
+        if not keepna:
+            mask_nan_or_zero = (df.isna() | (df == 0)).all(axis=1)
+            df = df.drop(mask_nan_or_zero.index[mask_nan_or_zero])
+
+        if dtype_profile != 'default':
+            df = utils.apply_dtype_profile(df, dtype_profile)
+
+        # Steps above mostly create new arrays. Copy only if result still shares
+        # some with stored raw prices, unless pandas copy-on-write does that lazily.
+        try:
+            copy_on_write = pd.get_option("mode.copy_on_write")
+        except KeyError:
+            # pandas < 1.5, OptionError is a KeyError
+            copy_on_write = False
+        if not copy_on_write:
+            for c in df.columns.intersection(raw.columns):
+                if np.may_share_memory(df[c].array, raw[c].array):
+                    df = df.copy()
+                    break
+        return df
+
+    def _build_history_request(self, period, interval, start, end, prepost, tz, range_max=False):
+        # Translate history() arguments into the chart URL & GET parameters.
+        # Returns None if the date range needs a timezone but none is known.
+        # range_max: send full history as range=max instead of dates, so no
+        # timezone needed (spark batches use this to skip tz lookups).
+        logger = utils.get_yf_logger()
+
         start_user = start
         end_user = end
-        if start or period is None or period.lower() == "max":
+        max_days = const.intraday_max_request_days.get(interval)
+        if max_days is not None and not start and period is not None and period.lower() != "max" and tz is not None:
+            # Period longer than Yahoo allows in one request: convert to dates so can split
+            period_end = int(_time.time()) if end is None else utils._parse_user_dt(end, tz)
+            try:
+                period_start = utils._period_to_start(period, period_end, tz)
+            except ValueError:
+                period_start = None
+            if period_start is not None and period_end - period_start > max_days * 86400:
+                # Yahoo has nothing older than lookback, so 'period' can only mean back to there
+                min_start = int(_time.time()) - (const.intraday_lookback_days[interval] - 1) * 86400
+                start = max(period_start, min_start)
+        if range_max and not start and end is None and (period is None or period.lower() == "max"):
+            period = "max"
+            params = {"range": period}
+        elif start or period is None or period.lower() == "max":
             # Check can get TZ. Fail => probably delisted
-            tz = self._get_ticker_tz(proxy, timeout)
             if tz is None:
-                # Every valid ticker has a timezone. Missing = problem
-                err_msg = "No timezone found, symbol may be delisted"
-                shared._DFS[self.ticker] = utils.empty_df()
-                shared._ERRORS[self.ticker] = err_msg
-                if raise_errors:
-                    raise Exception(f'{self.ticker}: {err_msg}')
-                else:
-                    logger.error(f'{self.ticker}: {err_msg}')
-                return utils.empty_df()
+                return None
 
             if end is None:
                 end = int(_time.time())
@@ -185,42 +575,185 @@ class TickerBase:
         params["events"] = "div,splits,capitalGains"
 
         params_pretty = dict(params)
-        tz = self._get_ticker_tz(proxy, timeout)
         for k in ["period1", "period2"]:
             if k in params_pretty:
                 params_pretty[k] = str(pd.Timestamp(params[k], unit='s').tz_localize("UTC").tz_convert(tz))
         logger.debug(f'{self.ticker}: Yahoo GET parameters: {str(params_pretty)}')
 
-        # Getting data from json
-        url = f"{self._base_url}/v8/finance/chart/{self.ticker}"
-        data = None
-        get_fn = self._data.get
+        cacheable = False
         if end is not None:
             end_dt = pd.Timestamp(end, unit='s').tz_localize("UTC")
             dt_now = pd.Timestamp.utcnow()
             data_delay = _datetime.timedelta(minutes=30)
             if end_dt + data_delay <= dt_now:
                 # Date range in past so safe to fetch through cache:
-                get_fn = self._data.cache_get
-        try:
-            data = get_fn(
-                url=url,
-                params=params,
-                proxy=proxy,
-                timeout=timeout
-            )
-            if "Will be right back" in data.text or data is None:
-                raise RuntimeError("*** YAHOO! FINANCE IS CURRENTLY DOWN! ***\n"
-                                   "Our engineers are working quickly to resolve "
-                                   "the issue. Thank you for your patience.")
+                cacheable = True
+
+        return {"url": f"{self._base_url}/v8/finance/chart/{self.ticker}",
+                "params": params,
+                "period": period, "interval": interval, "prepost": prepost, "tz": tz,
+                "start": start, "end": end, "start_user": start_user, "end_user": end_user,
+                "cacheable": cacheable}
+
+    def _split_history_request(self, request):
+        # Yahoo limits range of some intraday requests (1m = 7 days).
+        # Split longer ranges into windows Yahoo accepts.
+        params = request["params"]
+        max_days = const.intraday_max_request_days.get(request["interval"])
+        if max_days is None or "period1" not in params:
+            return [request]
+        start, end = params["period1"], params["period2"]
+        span = max_days * 86400
+        if end - start <= span:
+            return [request]
+        if start < _time.time() - const.intraday_lookback_days[request["interval"]] * 86400:
+            # Older than Yahoo has, let Yahoo's error explain
+            return [request]
+
+        windows = []
+        for period1 in range(start, end, span):
+            period2 = min(period1 + span, end)
+            window = dict(request)
+            window["params"] = dict(params, period1=period1, period2=period2)
+            window["cacheable"] = period2 + 30 * 60 <= _time.time()
+            windows.append(window)
+        utils.get_yf_logger().debug(f'{self.ticker}: splitting {request["interval"]} request into {len(windows)} windows')
+        return windows
+
+    def _fetch_history_windows(self, windows, proxy, timeout):
+        with _futures.ThreadPoolExecutor(max_workers=len(windows)) as executor:
+            datas = list(executor.map(lambda w: self._fetch_history_data(w, proxy, timeout), windows))
+        return self._merge_chart_data(datas)
+
+    @staticmethod
+    def _merge_chart_data(datas):
+        # Stitch chart JSON of consecutive windows together, dropping bars duplicated
+        # at window boundaries. If any window failed, return it so error is reported.
+        for data in datas:
+            try:
+                if data["chart"]["error"] is not None or not data["chart"]["result"]:
+                    return data
+            except Exception:
+                return data
+        results = [data["chart"]["result"][0] for data in datas]
+
+        # Latest window has most recent meta
+        merged = dict(results[-1])
+        merged["meta"] = dict(results[-1]["meta"])
+        results_ts = [r for r in results if "timestamp" in r]
+        if results_ts:
+            ts = np.concatenate([r["timestamp"] for r in results_ts])
+            _, keep = np.unique(ts, return_index=True)
+            merged["timestamp"] = ts[keep].tolist()
+            indicators = {}
+            for name, blocks in results_ts[0]["indicators"].items():
+                block = {}
+                for field in blocks[0]:
+                    values = [v for r in results_ts for v in r["indicators"][name][0][field]]
+                    block[field] = [values[i] for i in keep]
+                indicators[name] = [block]
+            merged["indicators"] = indicators
+
+        events = {}
+        for r in results:
+            for name, events_r in r.get("events", {}).items():
+                events.setdefault(name, {}).update(events_r)
+        if events:
+            merged["events"] = events
+
+        def _merge_periods(periods):
+            # List of per-day lists, drop days repeated across windows
+            out, seen = [], set()
+            for day in periods:
+                if day and day[0]["start"] not in seen:
+                    seen.add(day[0]["start"])
+                    out.append(day)
+            return out
+        tps = [r["meta"]["tradingPeriods"] for r in results if "tradingPeriods" in r["meta"]]
+        if tps:
+            if isinstance(tps[0], dict):
+                merged["meta"]["tradingPeriods"] = {k: _merge_periods([day for tp in tps for day in tp.get(k, [])])
+                                                    for k in tps[0]}
+            else:
+                merged["meta"]["tradingPeriods"] = _merge_periods([day for tp in tps for day in tp])
+
+        return {"chart": {"result": [merged], "error": None}}
+
+    def _fetch_history_data(self, request, proxy, timeout):
+        # Getting data from json
+        data = None
+        chart_cache_key = self._chart_cache_key(request)
+        if chart_cache_key is not None:
+            # Closed date range, check persistent cache first
+            data = cache.get_chart_cache().lookup(chart_cache_key)
+            if data is not None:
+                return data
 
-            data = data.json()
+        try:
+            if request["cacheable"]:
+                # Date range in past so safe to fetch through cache:
+                data = self._data.cache_get_raw_json(
+                    url=request["url"],
+                    params=request["params"],
+                    proxy=proxy,
+                    timeout=timeout
+                )
+            else:
+                data = self._data.get(
+                    url=request["url"],
+                    params=request["params"],
+                    proxy=proxy,
+                    timeout=timeout
+                )
+                if "Will be right back" in data.text or data is None:
+                    raise RuntimeError("*** YAHOO! FINANCE IS CURRENTLY DOWN! ***\n"
+                                       "Our engineers are working quickly to resolve "
+                                       "the issue. Thank you for your patience.")
+
+                data = utils.json_loads(data.content)
+        except YFRateLimitError:
+            raise
         except Exception:
             pass
+        else:
+            if chart_cache_key is not None and self._is_valid_chart_data(data):
+                cache.get_chart_cache().store(chart_cache_key, data)
+        return data
+
+    def _chart_cache_key(self, request):
+        # Only closed date ranges are stored on disk, a 'period' range keeps moving
+        params = request["params"]
+        if not request["cacheable"] or "period1" not in params:
+            return None
+        return cache.get_chart_cache().make_key(self.ticker, params["interval"], params["period1"],
+                                                params["period2"], params["includePrePost"])
+
+    @staticmethod
+    def _is_valid_chart_data(data):
+        try:
+            return data["chart"]["error"] is None and "timestamp" in data["chart"]["result"][0]
+        except Exception:
+            return False
+
+    def _process_history_data(self, data, request, actions=True, auto_adjust=True, back_adjust=False,
+                              repair=False, keepna=False, rounding=False, raise_errors=False,
+                              dtype_profile='default'):
+        # Turn the chart JSON returned by Yahoo into the history() DataFrame.
+        # Returns (DataFrame, raw prices, metadata), raw & metadata None if failed
+        logger = utils.get_yf_logger()
 
-        # Store the meta data that gets retrieved simultaneously
+        params = request["params"]
+        period = request["period"]
+        interval = request["interval"]
+        prepost = request["prepost"]
+        tz = request["tz"]
+        start, end = request["start"], request["end"]
+        start_user, end_user = request["start_user"], request["end_user"]
+
+        # Store the meta data that gets retrieved simultaneously.
+        # Copy because 'data' may be shared through response cache, and metadata gets formatted in-place.
         try:
-            self._history_metadata = data["chart"]["result"][0]["meta"]
+            self._history_metadata = copy.deepcopy(data["chart"]["result"][0]["meta"])
         except Exception:
             self._history_metadata = {}
 
@@ -261,54 +794,32 @@ class TickerBase:
             err_msg = f"Period '{period}' is invalid, must be one of {self._history_metadata['validRanges']}"
             fail = True
         if fail:
-            shared._DFS[self.ticker] = utils.empty_df()
-            shared._ERRORS[self.ticker] = err_msg
             if raise_errors:
                 raise Exception(f'{self.ticker}: {err_msg}')
             else:
                 logger.error(f'{self.ticker}: {err_msg}')
             if self._reconstruct_start_interval is not None and self._reconstruct_start_interval == interval:
                 self._reconstruct_start_interval = None
-            return utils.empty_df()
+            return utils.empty_df(), None, None
 
         # parse quotes
         try:
-            quotes = utils.parse_quotes(data["chart"]["result"][0])
+            quotes = utils.parse_quotes(data["chart"]["result"][0], dtype_profile)
             # Yahoo bug fix - it often appends latest price even if after end date
             if end and not quotes.empty:
                 endDt = pd.to_datetime(_datetime.datetime.utcfromtimestamp(end))
                 if quotes.index[quotes.shape[0] - 1] >= endDt:
                     quotes = quotes.iloc[0:quotes.shape[0] - 1]
         except Exception:
-            shared._DFS[self.ticker] = utils.empty_df()
-            shared._ERRORS[self.ticker] = err_msg
             if raise_errors:
                 raise Exception(f'{self.ticker}: {err_msg}')
             else:
                 logger.error(f'{self.ticker}: {err_msg}')
             if self._reconstruct_start_interval is not None and self._reconstruct_start_interval == interval:
                 self._reconstruct_start_interval = None
-            return shared._DFS[self.ticker]
+            return utils.empty_df(), None, None
         logger.debug(f'{self.ticker}: yfinance received OHLC data: {quotes.index[0]} -> {quotes.index[-1]}')
 
-        # 2) fix weired bug with Yahoo! - returning 60m for 30m bars
-        if interval.lower() == "30m":
-            logger.debug(f'{self.ticker}: resampling 30m OHLC from 15m')
-            quotes2 = quotes.resample('30T')
-            quotes = pd.DataFrame(index=quotes2.last().index, data={
-                'Open': quotes2['Open'].first(),
-                'High': quotes2['High'].max(),
-                'Low': quotes2['Low'].min(),
-                'Close': quotes2['Close'].last(),
-                'Adj Close': quotes2['Adj Close'].last(),
-                'Volume': quotes2['Volume'].sum()
-            })
-            try:
-                quotes['Dividends'] = quotes2['Dividends'].max()
-                quotes['Stock Splits'] = quotes2['Stock Splits'].max()
-            except Exception:
-                pass
-
         # Select useful info from metadata
         quote_type = self._history_metadata["instrumentType"]
         expect_capital_gains = quote_type in ('MUTUALFUND', 'ETF')
@@ -325,6 +836,11 @@ class TickerBase:
                 self._history_metadata = utils.format_history_metadata(self._history_metadata, tradingPeriodsOnly=True)
                 tps = self._history_metadata["tradingPeriods"]
             quotes = utils.fix_Yahoo_returning_prepost_unrequested(quotes, params["interval"], tps)
+
+        # 2) fix weired bug with Yahoo! - returning 60m for 30m bars
+        if interval.lower() == "30m":
+            logger.debug(f'{self.ticker}: resampling 30m OHLC from 15m')
+            quotes = utils.resample_history(quotes, "30m", self._get_trading_periods())
         logger.debug(f'{self.ticker}: OHLC after cleaning: {quotes.index[0]} -> {quotes.index[-1]}')
 
         # actions
@@ -395,6 +911,7 @@ class TickerBase:
         if isinstance(repair, str) and repair=='silent':
             utils.log_once(logging.WARNING, f"yfinance: Ticker.history(repair='silent') value is deprecated and will be removed in future version. Repair now silent by default, use logging module to increase verbosity.")
             repair = True
+        metadata = self._history_metadata
         if repair:
             # Do this before auto/back adjust
             logger.debug(f'{self.ticker}: checking OHLC for repairs ...')
@@ -404,48 +921,25 @@ class TickerBase:
             df = self._fix_zeroes(df, interval, tz_exchange, prepost)
             df = self._fix_missing_div_adjust(df, interval, tz_exchange)
             df = df.sort_index()
-
-        # Auto/back adjust
-        try:
-            if auto_adjust:
-                df = utils.auto_adjust(df)
-            elif back_adjust:
-                df = utils.back_adjust(df)
-        except Exception as e:
-            if auto_adjust:
-                err_msg = "auto_adjust failed with %s" % e
-            else:
-                err_msg = "back_adjust failed with %s" % e
-            shared._DFS[self.ticker] = utils.empty_df()
-            shared._ERRORS[self.ticker] = err_msg
-            if raise_errors:
-                raise Exception('%s: %s' % (self.ticker, err_msg))
-            else:
-                logger.error('%s: %s' % (self.ticker, err_msg))
-
-        if rounding:
-            df = np.round(df, data["chart"]["result"][0]["meta"]["priceHint"])
-        df['Volume'] = df['Volume'].fillna(0).astype(np.int64)
+            # Repair fetches finer data through history(), which replaced metadata
+            self._history_metadata = metadata
 
         if intraday:
             df.index.name = "Datetime"
         else:
             df.index.name = "Date"
 
-        self._history = df.copy()
-
-        # missing rows cleanup
-        if not actions:
-            df = df.drop(columns=["Dividends", "Stock Splits", "Capital Gains"], errors='ignore')
-        if not keepna:
-            mask_nan_or_zero = (df.isna() | (df == 0)).all(axis=1)
-            df = df.drop(mask_nan_or_zero.index[mask_nan_or_zero])
+        raw = df
+        df = self._finalise_history(df, actions=actions, auto_adjust=auto_adjust, back_adjust=back_adjust,
+                                    keepna=keepna, rounding=rounding,
+                                    price_hint=data["chart"]["result"][0]["meta"]["priceHint"],
+                                    raise_errors=raise_errors, dtype_profile=dtype_profile)
 
         logger.debug(f'{self.ticker}: yfinance returning OHLC: {df.index[0]} -> {df.index[-1]}')
 
         if self._reconstruct_start_interval is not None and self._reconstruct_start_interval == interval:
             self._reconstruct_start_interval = None
-        return df
+        return df, raw, metadata
 
     # ------------------------
 
@@ -475,10 +969,9 @@ class TickerBase:
         intervals = ["1wk", "1d", "1h", "30m", "15m", "5m", "2m", "1m"]
         itds = {i: utils._interval_to_timedelta(interval) for i in intervals}
         nexts = {intervals[i]: intervals[i + 1] for i in range(len(intervals) - 1)}
-        min_lookbacks = {"1wk": None, "1d": None, "1h": _datetime.timedelta(days=730)}
-        for i in ["30m", "15m", "5m", "2m"]:
-            min_lookbacks[i] = _datetime.timedelta(days=60)
-        min_lookbacks["1m"] = _datetime.timedelta(days=30)
+        min_lookbacks = {"1wk": None, "1d": None}
+        for i in ["1h", "30m", "15m", "5m", "2m", "1m"]:
+            min_lookbacks[i] = _datetime.timedelta(days=const.intraday_lookback_days[i])
         if interval in nexts:
             sub_interval = nexts[interval]
             td_range = itds[interval]
@@ -659,7 +1152,7 @@ class TickerBase:
                 df_fine["Week Start"] = df_fine.index.tz_localize(None).to_period("W-" + week_end_day).start_time
                 grp_col = "Week Start"
             elif interval == "1d":
-                df_fine["Day Start"] = pd.to_datetime(df_fine.index.date)
+                df_fine["Day Start"] = utils._local_dates(df_fine.index)
                 grp_col = "Day Start"
             else:
                 df_fine.loc[df_fine.index.isin(df_block.index), "ctr"] = 1
@@ -1027,10 +1520,11 @@ class TickerBase:
         df2_reserve = None
         if intraday:
             # Ignore days with >50% intervals containing NaNs
-            grp = pd.Series(f_prices_bad.any(axis=1), name="nan").groupby(f_prices_bad.index.date)
+            dates = utils._local_dates(f_prices_bad.index)
+            grp = pd.Series(f_prices_bad.any(axis=1).to_numpy(), name="nan").groupby(dates)
             nan_pct = grp.sum() / grp.count()
             dts = nan_pct.index[nan_pct > 0.5]
-            f_zero_or_nan_ignore = np.isin(f_prices_bad.index.date, dts)
+            f_zero_or_nan_ignore = np.isin(dates, dts)
             df2_reserve = df2[f_zero_or_nan_ignore]
             df2 = df2[~f_zero_or_nan_ignore]
             f_prices_bad = (df2[price_cols] == 0.0) | df2[price_cols].isna()
@@ -1673,8 +2167,9 @@ class TickerBase:
         url = f"{self._base_url}/v8/finance/chart/{self.ticker}"
 
         try:
-            data = self._data.cache_get(url=url, params=params, proxy=proxy, timeout=timeout)
-            data = data.json()
+            data = self._data.cache_get_raw_json(url=url, params=params, proxy=proxy, timeout=timeout)
+        except YFRateLimitError:
+            raise
         except Exception as e:
             logger.error(f"Failed to get ticker '{self.ticker}' reason: {e}")
             return None
@@ -1910,38 +2405,84 @@ class TickerBase:
     def get_cashflow(self, proxy=None, as_dict=False, pretty=False, freq="yearly"):
         return self.get_cash_flow(proxy, as_dict, pretty, freq)
 
+    def adjust_history(self, auto_adjust=True, back_adjust=False, actions=True, keepna=False,
+                       rounding=False, dtype_profile='default') -> pd.DataFrame:
+        """
+        Prices of the last history() call with a different adjustment,
+        without refetching. Arguments as history().
+        """
+        utils.check_dtype_profile(dtype_profile)
+        if self._history is None or self._history_factor is None:
+            return utils.empty_df()
+        price_hint = (self._history_metadata or {}).get("priceHint", 2)
+        return self._finalise_history(self._history.copy(deep=False), actions=actions, auto_adjust=auto_adjust,
+                                      back_adjust=back_adjust, keepna=keepna, rounding=rounding,
+                                      price_hint=price_hint, raise_errors=False,
+                                      dtype_profile=dtype_profile, keep_raw=False)
+
+    def _get_actions(self, proxy=None):
+        # Dividends, splits & capital gains over full history. Only needs
+        # Yahoo's events, so fetch at 3mo interval = tiny fraction of daily prices.
+        # Actions don't change intraday, so reuse a fetch up to a day old.
+        if self._actions is not None and _time.time() - self._actions[0] < self._memo_max_age:
+            return self._actions[1]
+
+        tz = self._get_ticker_tz(proxy, 10)
+        request = self._build_history_request("max", "3mo", None, None, False, tz)
+        if request is None:
+            utils.get_yf_logger().error(f"{self.ticker}: No timezone found, symbol may be delisted")
+            return None
+        data = self._fetch_history_data(request, proxy, 10)
+        try:
+            result = data["chart"]["result"][0]
+            tz_exchange = result["meta"]["exchangeTimezoneName"]
+        except Exception:
+            utils.get_yf_logger().error(f"{self.ticker}: No actions data found, symbol may be delisted")
+            return None
+
+        dividends, splits, capital_gains = utils.parse_actions(result)
+        events = [dividends, splits]
+        if result["meta"].get("instrumentType") in ('MUTUALFUND', 'ETF'):
+            events.append(capital_gains)
+        for i, df in enumerate(events):
+            # Same dates as daily history()
+            df = utils.set_df_tz(df.astype('float64'), "1d", tz_exchange)
+            df.index = pd.to_datetime(df.index.date).tz_localize(tz_exchange, ambiguous=True, nonexistent='shift_forward')
+            events[i] = df.groupby(level=0).sum()
+        actions = pd.concat(events, axis=1).fillna(0).sort_index()
+        actions.index.name = "Date"
+
+        self._actions = (_time.time(), actions)
+        return actions
+
     def get_dividends(self, proxy=None):
-        if self._history is None:
-            self.history(period="max", proxy=proxy)
-        if self._history is not None and "Dividends" in self._history:
-            dividends = self._history["Dividends"]
+        actions = self._get_actions(proxy)
+        if actions is not None and "Dividends" in actions:
+            dividends = actions["Dividends"]
             return dividends[dividends != 0]
         return []
 
     def get_capital_gains(self, proxy=None):
-        if self._history is None:
-            self.history(period="max", proxy=proxy)
-        if self._history is not None and "Capital Gains" in self._history:
-            capital_gains = self._history["Capital Gains"]
+        actions = self._get_actions(proxy)
+        if actions is not None and "Capital Gains" in actions:
+            capital_gains = actions["Capital Gains"]
             return capital_gains[capital_gains != 0]
         return []
 
     def get_splits(self, proxy=None):
-        if self._history is None:
-            self.history(period="max", proxy=proxy)
-        if self._history is not None and "Stock Splits" in self._history:
-            splits = self._history["Stock Splits"]
+        actions = self._get_actions(proxy)
+        if actions is not None and "Stock Splits" in actions:
+            splits = actions["Stock Splits"]
             return splits[splits != 0]
         return []
 
     def get_actions(self, proxy=None):
-        if self._history is None:
-            self.history(period="max", proxy=proxy)
-        if self._history is not None and "Dividends" in self._history and "Stock Splits" in self._history:
+        actions = self._get_actions(proxy)
+        if actions is not None and "Dividends" in actions and "Stock Splits" in actions:
             action_columns = ["Dividends", "Stock Splits"]
-            if "Capital Gains" in self._history:
+            if "Capital Gains" in actions:
                 action_columns.append("Capital Gains")
-            actions = self._history[action_columns]
+            actions = actions[action_columns]
             return actions[actions != 0].dropna(how='all').fillna(0)
         return []
 
@@ -1981,8 +2522,7 @@ class TickerBase:
         ts_url_base = f"https://query2.finance.yahoo.com/ws/fundamentals-timeseries/v1/finance/timeseries/{self.ticker}?symbol={self.ticker}"
         shares_url = f"{ts_url_base}&period1={int(start.timestamp())}&period2={int(end.timestamp())}"
         try:
-            json_data = self._data.cache_get(url=shares_url, proxy=proxy)
-            json_data = json_data.json()
+            json_data = self._data.cache_get_raw_json(url=shares_url, proxy=proxy)
         except (_json.JSONDecodeError, requests.exceptions.RequestException):
             logger.error(f"{self.ticker}: Yahoo web request for share count failed")
             return None
@@ -2028,7 +2568,7 @@ class TickerBase:
             q = self._quote.info['shortName']
 
         url = f'https://markets.businessinsider.com/ajax/SearchController_Suggest?max_results=25&query={urlencode(q)}'
-        data = self._data.cache_get(url=url, proxy=proxy).text
+        data = self._data.cache_get_text(url=url, proxy=proxy)
 
         search_str = f'"{ticker}|'
         if search_str not in data:
@@ -2050,15 +2590,10 @@ class TickerBase:
 
         # Getting data from json
         url = f"{self._base_url}/v1/finance/search?q={self.ticker}"
-        data = self._data.cache_get(url=url, proxy=proxy)
-        if "Will be right back" in data.text:
-            raise RuntimeError("*** YAHOO! FINANCE IS CURRENTLY DOWN! ***\n"
-                               "Our engineers are working quickly to resolve "
-                               "the issue. Thank you for your patience.")
-        data = data.json()
+        data = self._data.cache_get_raw_json(url=url, proxy=proxy)
 
         # parse news
-        self._news = data.get("news", [])
+        self._news = copy.deepcopy(data.get("news", []))
         return self._news
 
     @utils.log_indent_decorator
@@ -2082,7 +2617,7 @@ class TickerBase:
         dates = None
         while True:
             url = f"{_ROOT_URL_}/calendar/earnings?symbol={self.ticker}&offset={page_offset}&size={page_size}"
-            data = self._data.cache_get(url=url, proxy=proxy).text
+            data = self._data.cache_get_text(url=url, proxy=proxy)
 
             if "Will be right back" in data:
                 raise RuntimeError("*** YAHOO! FINANCE IS CURRENTLY DOWN! ***\n"
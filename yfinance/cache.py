@@ -1,12 +1,21 @@
 import peewee as _peewee
 from threading import Lock
 import os as _os
+import shutil as _shutil
+import urllib.parse as _urlparse
 import appdirs as _ad
 import atexit as _atexit
 import datetime as _datetime
 import pickle as _pkl
+import time as _time
+import zlib as _zlib
+import sys as _sys
+from collections import OrderedDict as _OrderedDict
 
-from .utils import get_yf_logger
+import numpy as _np
+import pandas as _pd
+
+from .utils import get_yf_logger, _json
 
 _cache_init_lock = Lock()
 
@@ -206,6 +215,114 @@ def set_tz_cache_location(cache_dir: str):
     :return: None
     """
     _TzDBManager.set_location(cache_dir)
+    _ChartDBManager.set_location(cache_dir)
+    _PriceStoreManager.set_location(cache_dir)
+
+
+
+# --------------
+# Response cache
+# --------------
+
+class _ResponseCache:
+    """
+    In-memory cache of decoded Yahoo responses (JSON or text, never
+    'requests.Response' objects). Bounded by total size in bytes,
+    least-recently-used entries are evicted first. Entries also
+    expire after a TTL that depends on the endpoint.
+
+    Cached values are shared between callers: treat them as read-only.
+    """
+
+    # Seconds a response stays valid, matched by substring of URL.
+    # Closed chart ranges still change when Yahoo re-adjusts prices
+    # for a new dividend or split, so don't hold them forever.
+    default_ttls = {
+        '/v8/finance/chart/': 60 * 60,
+        '/fundamentals-timeseries/': 24 * 60 * 60,
+        '/v1/finance/search': 15 * 60,
+        '/calendar/earnings': 60 * 60,
+    }
+    default_ttl = 60 * 60
+
+    # Decoded JSON takes several times the memory of its bytes on the wire
+    # (boxed floats, dicts per field): measured ~2x for charts, ~5x for
+    # quoteSummary. Budget with the upper end so 'max_bytes' bounds memory.
+    json_size_factor = 5
+
+    def __init__(self, max_bytes=128 * 1024 * 1024, ttls=None):
+        self.max_bytes = max_bytes
+        self.ttls = dict(self.default_ttls if ttls is None else ttls)
+        self._entries = _OrderedDict()  # key -> (value, nbytes, expiry)
+        self._nbytes = 0
+        self._lock = Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+
+    def estimate_nbytes(self, kind, content, value):
+        # Memory held by cached 'value', decoded from response bytes 'content'
+        if kind == 'json':
+            return len(content) * self.json_size_factor
+        return _sys.getsizeof(value)
+
+    def ttl_for(self, url):
+        for pattern, ttl in self.ttls.items():
+            if pattern in url:
+                return ttl
+        return self.default_ttl
+
+    def lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            value, nbytes, expiry = entry
+            if expiry <= _time.monotonic():
+                self._remove(key)
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return value
+
+    def store(self, key, value, nbytes, ttl):
+        if nbytes > self.max_bytes or ttl <= 0:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, nbytes, _time.monotonic() + ttl)
+            self._nbytes += nbytes
+            while self._nbytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._stats['evictions'] += 1
+
+    def _remove(self, key):
+        _, nbytes, _ = self._entries.pop(key)
+        self._nbytes -= nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def info(self):
+        with self._lock:
+            return {**self._stats, 'entries': len(self._entries),
+                    'nbytes': self._nbytes, 'max_bytes': self.max_bytes}
+
+
+_response_cache = None
+
+
+def get_response_cache():
+    global _response_cache
+    if _response_cache is None:
+        with _cache_init_lock:
+            if _response_cache is None:
+                _response_cache = _ResponseCache()
+    return _response_cache
 
 
 
@@ -398,3 +515,418 @@ class _CookieCache:
 def get_cookie_cache():
     return _CookieCacheManager.get_cookie_cache()
 
+
+
+# --------------
+# Chart cache
+# --------------
+
+class _ChartCacheException(Exception):
+    pass
+
+
+class _ChartCacheManager:
+    _chart_cache = None
+
+    @classmethod
+    def get_chart_cache(cls):
+        if cls._chart_cache is None:
+            with _cache_init_lock:
+                cls._initialise()
+        return cls._chart_cache
+
+    @classmethod
+    def _initialise(cls, cache_dir=None):
+        cls._chart_cache = _ChartCache()
+
+
+class _ChartDBManager:
+    _db = None
+    _cache_dir = _os.path.join(_ad.user_cache_dir(), "py-yfinance")
+
+    @classmethod
+    def get_database(cls):
+        if cls._db is None:
+            cls._initialise()
+        return cls._db
+
+    @classmethod
+    def close_db(cls):
+        if cls._db is not None:
+            try:
+                cls._db.close()
+            except Exception:
+                # Must discard exceptions because Python trying to quit.
+                pass
+
+
+    @classmethod
+    def _initialise(cls, cache_dir=None):
+        if cache_dir is not None:
+            cls._cache_dir = cache_dir
+
+        if not _os.path.isdir(cls._cache_dir):
+            try:
+                _os.makedirs(cls._cache_dir)
+            except OSError as err:
+                raise _ChartCacheException(f"Error creating ChartCache folder: '{cls._cache_dir}' reason: {err}")
+        elif not (_os.access(cls._cache_dir, _os.R_OK) and _os.access(cls._cache_dir, _os.W_OK)):
+            raise _ChartCacheException(f"Cannot read and write in ChartCache folder: '{cls._cache_dir}'")
+
+        cls._db = _peewee.SqliteDatabase(
+            _os.path.join(cls._cache_dir, 'charts.db'),
+            pragmas={'journal_mode': 'wal', 'cache_size': -64}
+        )
+
+    @classmethod
+    def set_location(cls, new_cache_dir):
+        if cls._db is not None:
+            cls._db.close()
+            cls._db = None
+        cls._cache_dir = new_cache_dir
+
+    @classmethod
+    def get_location(cls):
+        return cls._cache_dir
+
+# close DB when Python exists
+_atexit.register(_ChartDBManager.close_db)
+
+
+chart_db_proxy = _peewee.Proxy()
+class _ChartSchema(_peewee.Model):
+    # symbol|interval|period1|period2|prepost
+    key = _peewee.CharField(primary_key=True)
+    fetch_date = _peewee.DateTimeField(default=_datetime.datetime.now)
+
+    # zlib-compressed chart JSON
+    payload = _peewee.BlobField()
+
+    class Meta:
+        database = chart_db_proxy
+        without_rowid = True
+
+
+class _ChartCache:
+    """
+    Persistent store of chart JSON for date ranges that have closed,
+    so restarted processes don't re-download them.
+    """
+
+    # Yahoo re-adjusts old prices after a split, so even closed ranges go stale eventually
+    max_age = _datetime.timedelta(days=7)
+    # Beyond this many charts, oldest are deleted. Checked on open and every 'prune_every' stores.
+    max_entries = 10000
+    prune_every = 1000
+
+    def __init__(self):
+        self.initialised = -1
+        self.db = None
+        self.dummy = False
+        self._n_stores = 0
+
+    @staticmethod
+    def make_key(symbol, interval, period1, period2, prepost):
+        return f"{symbol}|{interval}|{period1}|{period2}|{prepost}"
+
+    def get_db(self):
+        if self.db is not None:
+            return self.db
+
+        try:
+            self.db = _ChartDBManager.get_database()
+        except _ChartCacheException as err:
+            get_yf_logger().info(f"Failed to create ChartCache, reason: {err}. "
+                                 "ChartCache will not be used. "
+                                 "Tip: You can direct cache to use a different location with 'set_tz_cache_location(mylocation)'")
+            self.dummy = True
+            return None
+        return self.db
+
+    def initialise(self):
+        if self.initialised != -1:
+            return
+
+        db = self.get_db()
+        if db is None:
+            self.initialised = 0  # failure
+            return
+
+        db.connect()
+        chart_db_proxy.initialize(db)
+        db.create_tables([_ChartSchema])
+        self.initialised = 1  # success
+        self.prune()
+
+    def prune(self):
+        # Delete expired charts, then oldest beyond 'max_entries', so charts.db can't grow without limit
+        try:
+            with self.db.atomic():
+                _ChartSchema.delete().where(_ChartSchema.fetch_date < _datetime.datetime.now() - self.max_age).execute()
+                n = _ChartSchema.select().count()
+                if n > self.max_entries:
+                    oldest = _ChartSchema.select(_ChartSchema.key).order_by(_ChartSchema.fetch_date).limit(n - self.max_entries)
+                    _ChartSchema.delete().where(_ChartSchema.key.in_(oldest)).execute()
+        except _peewee.PeeweeException as e:
+            get_yf_logger().debug(f"Failed to prune chart cache, reason: {e}")
+
+    def lookup(self, key):
+        if self.dummy:
+            return None
+
+        if self.initialised == -1:
+            self.initialise()
+
+        if self.initialised == 0:  # failure
+            return None
+
+        try:
+            row = _ChartSchema.get(_ChartSchema.key == key)
+        except _ChartSchema.DoesNotExist:
+            return None
+        if _datetime.datetime.now() - row.fetch_date > self.max_age:
+            try:
+                row.delete_instance()
+            except _peewee.PeeweeException:
+                pass
+            return None
+        try:
+            return _json.loads(_zlib.decompress(row.payload))
+        except Exception:
+            # Corrupt entry, ignore
+            return None
+
+    def store(self, key, data):
+        if self.dummy:
+            return
+
+        if self.initialised == -1:
+            self.initialise()
+
+        if self.initialised == 0:  # failure
+            return
+
+        db = self.get_db()
+        if db is None:
+            return
+        payload = _zlib.compress(_json.dumps(data).encode('utf-8'))
+        try:
+            with db.atomic():
+                _ChartSchema.replace(key=key, payload=payload,
+                                     fetch_date=_datetime.datetime.now()).execute()
+        except _peewee.PeeweeException as e:
+            get_yf_logger().debug(f"Failed to store chart in cache, reason: {e}")
+            return
+        self._n_stores += 1
+        if self._n_stores % self.prune_every == 0:
+            self.prune()
+
+
+def get_chart_cache():
+    return _ChartCacheManager.get_chart_cache()
+
+
+# --------------
+# Price store
+# --------------
+
+class _PriceStoreException(Exception):
+    pass
+
+
+class _PriceStoreManager:
+    _price_store = None
+    _cache_dir = _os.path.join(_ad.user_cache_dir(), "py-yfinance")
+
+    @classmethod
+    def get_price_store(cls):
+        if cls._price_store is None:
+            with _cache_init_lock:
+                if cls._price_store is None:
+                    cls._price_store = _PriceStore(_os.path.join(cls._cache_dir, "prices"))
+        return cls._price_store
+
+    @classmethod
+    def set_location(cls, new_cache_dir):
+        cls._cache_dir = new_cache_dir
+        cls._price_store = None
+
+    @classmethod
+    def get_location(cls):
+        return cls._cache_dir
+
+
+class _PriceStore:
+    """
+    Local columnar store of price history: one memory-mapped .npy file per
+    column under <cache>/prices/<symbol>/<partition>/, timestamps as UTC
+    nanoseconds. Range reads binary-search the index and only copy the
+    requested rows.
+
+    Each partition records the date range it covers, so a read can tell
+    whether it is complete or must go to Yahoo. It also records when it was
+    fetched and the dividends/splits known then: a new event re-adjusts all
+    earlier prices, making stored ones stale.
+    """
+
+    # Same reasoning as chart cache: even without a new event, refresh eventually
+    max_age = _datetime.timedelta(days=7)
+    # Checking for new events costs a request, so at most once per this period
+    events_max_age = _datetime.timedelta(days=1)
+
+    def __init__(self, root):
+        self.root = root
+        self.dummy = False
+        self._lock = Lock()
+
+    @staticmethod
+    def make_key(interval, prepost, repair):
+        key = interval
+        if prepost:
+            key += "-prepost"
+        if repair:
+            key += "-repair"
+        return key
+
+    def _dir(self, symbol, key):
+        return _os.path.join(self.root, _urlparse.quote(symbol.upper(), safe=''), key)
+
+    def read_meta(self, symbol, key):
+        if self.dummy:
+            return None
+        try:
+            with open(_os.path.join(self._dir(symbol, key), "meta.json"), 'rb') as f:
+                return _json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, part_dir, meta):
+        meta_path = _os.path.join(part_dir, "meta.json")
+        tmp_path = f"{meta_path}.{_os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(_json.dumps(meta))
+        # Swap atomically, readers see old or new data never a mix
+        _os.replace(tmp_path, meta_path)
+
+    def drop(self, symbol, key):
+        # Forget a partition whose data can't be read anymore
+        if self.dummy:
+            return
+        with self._lock:
+            _shutil.rmtree(self._dir(symbol, key), ignore_errors=True)
+
+    def covers(self, meta, start, end):
+        return meta is not None and meta["start"] <= start and end <= meta["end"]
+
+    def is_stale(self, meta, events=None):
+        # 'events' = current (count, last timestamp) of ticker's actions, None if unknown
+        if meta is None:
+            return False
+        if _time.time() - meta.get("fetched", 0) > self.max_age.total_seconds():
+            return True
+        return events is not None and meta.get("events") != list(events)
+
+    def events_due(self, meta):
+        # True if stored events were last checked over 'events_max_age' ago
+        checked = meta.get("events_checked", meta.get("fetched", 0))
+        return _time.time() - checked > self.events_max_age.total_seconds()
+
+    def set_events_checked(self, symbol, key):
+        # Record that stored events still match Yahoo's
+        if self.dummy:
+            return
+        with self._lock:
+            meta = self.read_meta(symbol, key)
+            if meta is None:
+                return
+            meta["events_checked"] = int(_time.time())
+            try:
+                self._write_meta(self._dir(symbol, key), meta)
+            except OSError as e:
+                get_yf_logger().debug(f"{symbol}: failed to update price store, reason: {e}")
+
+    def read(self, symbol, key, start=None, end=None):
+        """
+        Rows with timestamp in [start, end) (epoch seconds, None = unbounded)
+        as a DataFrame in the stored timezone. None if nothing stored.
+        """
+        meta = self.read_meta(symbol, key)
+        if meta is None:
+            return None
+        data_dir = _os.path.join(self._dir(symbol, key), meta["data"])
+        try:
+            index = _np.load(_os.path.join(data_dir, "index.npy"), mmap_mode='r')
+            i0 = 0 if start is None else _np.searchsorted(index, start * 10**9, side='left')
+            i1 = len(index) if end is None else _np.searchsorted(index, end * 10**9, side='left')
+            columns = {}
+            for i, c in enumerate(meta["columns"]):
+                values = _np.load(_os.path.join(data_dir, f"c{i}.npy"), mmap_mode='r')
+                columns[c] = _np.array(values[i0:i1])
+            dt_index = _pd.DatetimeIndex(_np.array(index[i0:i1]).view("datetime64[ns]"), name=meta["index_name"])
+        except (OSError, ValueError) as e:
+            get_yf_logger().debug(f"{symbol}: failed to read price store, reason: {e}")
+            return None
+        dt_index = dt_index.tz_localize("UTC").tz_convert(meta["tz"])
+        return _pd.DataFrame(columns, index=dt_index)
+
+    def write(self, symbol, key, df, tz, start, end, price_hint=None, events=None):
+        """
+        Merge 'df' into stored data and extend covered range with [start, end).
+        If Yahoo has since changed overlapping prices (e.g. re-adjusted after
+        a split), stored data is stale and replaced with 'df'.
+        'events' is recorded for is_stale(), as checked now unless same as stored.
+        """
+        if self.dummy or df is None or df.shape[0] == 0:
+            return
+        with self._lock:
+            meta = self.read_meta(symbol, key)
+            old = self.read(symbol, key) if meta is not None else None
+            if old is not None and old.shape[0] > 0 and list(old.columns) == list(df.columns) \
+                    and start <= meta["end"] and meta["start"] <= end:
+                common = old.index.intersection(df.index)
+                price_cols = [c for c in ["Open", "High", "Low", "Close", "Adj Close"] if c in df.columns]
+                if _np.allclose(old.loc[common, price_cols].to_numpy(dtype=float),
+                                df.loc[common, price_cols].to_numpy(dtype=float),
+                                rtol=1e-5, equal_nan=True):
+                    df = _pd.concat([old[~old.index.isin(df.index)], df]).sort_index()
+                    start, end = min(start, meta["start"]), max(end, meta["end"])
+
+            part_dir = self._dir(symbol, key)
+            data_name = f"d{_time.time_ns()}"
+            data_dir = _os.path.join(part_dir, data_name)
+            try:
+                _os.makedirs(data_dir)
+                index = df.index.tz_convert("UTC").tz_localize(None).to_numpy(dtype="datetime64[ns]").view(_np.int64)
+                _np.save(_os.path.join(data_dir, "index.npy"), index)
+                for i, c in enumerate(df.columns):
+                    _np.save(_os.path.join(data_dir, f"c{i}.npy"), df[c].to_numpy())
+                if price_hint is None and meta is not None:
+                    price_hint = meta.get("price_hint")
+                events = None if events is None else list(events)
+                events_checked = int(_time.time())
+                if meta is not None and events is not None and meta.get("events") == events:
+                    # Caller may be reusing stored events, keep when really checked
+                    events_checked = meta.get("events_checked", meta.get("fetched", events_checked))
+                new_meta = {"tz": tz, "columns": list(df.columns), "index_name": df.index.name,
+                            "start": int(start), "end": int(end), "data": data_name,
+                            "price_hint": price_hint, "fetched": int(_time.time()),
+                            "events": events, "events_checked": events_checked}
+                self._write_meta(part_dir, new_meta)
+            except OSError as e:
+                get_yf_logger().info(f"Failed to write price store, reason: {e}. "
+                                     "Price store will not be used. "
+                                     "Tip: You can direct cache to use a different location with 'set_tz_cache_location(mylocation)'")
+                self.dummy = True
+                _shutil.rmtree(data_dir, ignore_errors=True)
+                return
+            if meta is not None:
+                # Memory-mapped readers keep working on POSIX, elsewhere removal can fail
+                _shutil.rmtree(_os.path.join(part_dir, meta["data"]), ignore_errors=True)
+
+    def clear(self, symbol=None):
+        _shutil.rmtree(self.root if symbol is None else _os.path.join(self.root, _urlparse.quote(symbol.upper(), safe='')),
+                       ignore_errors=True)
+
+
+def get_price_store():
+    return _PriceStoreManager.get_price_store()
@@ -1,6 +1,11 @@
 _BASE_URL_ = 'https://query2.finance.yahoo.com'
 _ROOT_URL_ = 'https://finance.yahoo.com'
 
+# Yahoo's chart limits for intraday intervals, in days:
+# how far back each interval is available, and longest range of one request
+intraday_lookback_days = {"1h": 730, "60m": 730, "90m": 60, "30m": 60, "15m": 60, "5m": 60, "2m": 60, "1m": 30}
+intraday_max_request_days = {"1m": 7}
+
 fundamentals_keys = {
     'financials': ["TaxEffectOfUnusualItems", "TaxRateForCalcs", "NormalizedEBITDA", "NormalizedDilutedEPS",
                    "NormalizedBasicEPS", "TotalUnusualItems", "TotalUnusualItemsExcludingGoodwill",
@@ -1,37 +1,15 @@
-import functools
-from functools import lru_cache
-
 import requests as requests
 from bs4 import BeautifulSoup
 import datetime
+import random
+import time
+from collections import namedtuple
+from email.utils import parsedate_to_datetime
 
 from frozendict import frozendict
 
 from . import utils, cache
-
-cache_maxsize = 64
-
-
-def lru_cache_freezeargs(func):
-    """
-    Decorator transforms mutable dictionary and list arguments into immutable types
-    Needed so lru_cache can cache method calls what has dict or list arguments.
-    """
-
-    @functools.wraps(func)
-    def wrapped(*args, **kwargs):
-        args = tuple([frozendict(arg) if isinstance(arg, dict) else arg for arg in args])
-        kwargs = {k: frozendict(v) if isinstance(v, dict) else v for k, v in kwargs.items()}
-        args = tuple([tuple(arg) if isinstance(arg, list) else arg for arg in args])
-        kwargs = {k: tuple(v) if isinstance(v, list) else v for k, v in kwargs.items()}
-        return func(*args, **kwargs)
-
-    # copy over the lru_cache extra methods to this wrapper to be able to access them
-    # after this decorator has been applied
-    wrapped.cache_info = func.cache_info
-    wrapped.cache_clear = func.cache_clear
-    return wrapped
-
+from .exceptions import YFRateLimitError
 
 import threading
 class SingletonMeta(type):
@@ -51,6 +29,133 @@ class SingletonMeta(type):
             return cls._instances[cls]
 
 
+# Immutable snapshot of cookie & crumb. Replaced, never modified, so threads
+# can read YfData._credentials without taking the lock.
+_Credentials = namedtuple('_Credentials', ['cookie', 'crumb', 'strategy', 'generation'])
+
+
+class _InflightRequest:
+    """A fetch in progress, that identical concurrent fetches wait on instead of repeating"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+
+
+class _RateLimiter:
+    """
+    Token bucket shared by all requests to Yahoo. Rate adapts AIMD-style:
+    halved when Yahoo answers 429, slowly raised again on success.
+    After repeated throttling a circuit breaker stops all requests for a while.
+    max_rate None = no pacing, only backing off when Yahoo throttles.
+    """
+
+    max_rate = 20.0  # requests per second
+    min_rate = 0.5
+    burst = 20
+    rate_increase = 0.2  # per successful request
+    breaker_threshold = 5  # consecutive throttled responses
+    breaker_cooldown = 60.0  # seconds
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rate = self.max_rate
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        # Nothing sent before this time, set by Retry-After
+        self._paused_until = 0.0
+        self._failures = 0
+        self._open_until = 0.0
+
+    def reserve(self):
+        """
+        Take a token, return seconds caller must wait before sending.
+        Raises YFRateLimitError if circuit breaker is open.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self._open_until:
+                raise YFRateLimitError(self._open_until - now)
+
+            wait = 0.0
+            if self.max_rate is not None:
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self._rate)
+                self._last = now
+                self._tokens -= 1
+                if self._tokens < 0:
+                    wait = -self._tokens / self._rate
+            return max(wait, self._paused_until - now)
+
+    def configure(self, max_rate, burst):
+        with self._lock:
+            self.max_rate = None if max_rate is None else float(max_rate)
+            self.burst = burst
+            self._rate = self.max_rate
+            self._tokens = float(burst)
+            self._last = time.monotonic()
+
+    def on_success(self):
+        with self._lock:
+            self._failures = 0
+            if self.max_rate is not None:
+                self._rate = min(self.max_rate, self._rate + self.rate_increase)
+
+    def on_throttled(self, retry_after=None):
+        with self._lock:
+            now = time.monotonic()
+            self._failures += 1
+            if self.max_rate is not None:
+                self._rate = max(self.min_rate, self._rate / 2)
+            if retry_after is not None:
+                self._paused_until = max(self._paused_until, now + retry_after)
+            if self._failures >= self.breaker_threshold:
+                utils.get_yf_logger().debug(f'rate-limit circuit breaker open for {self.breaker_cooldown}s')
+                self._open_until = now + self.breaker_cooldown
+                # Half-open after cooldown: next failure re-opens immediately
+                self._failures = self.breaker_threshold - 1
+            if self.max_rate is not None:
+                utils.get_yf_logger().debug(f'throttled by Yahoo, rate now {self._rate:.2f}/s')
+
+    @staticmethod
+    def parse_retry_after(value):
+        # Retry-After is either seconds or an HTTP date
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            dt = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, (dt - datetime.datetime.now(dt.tzinfo)).total_seconds())
+
+    @staticmethod
+    def backoff(attempt, base=0.5, cap=30.0):
+        # Exponential backoff with "full jitter"
+        return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def set_rate_limit(rate=_RateLimiter.max_rate, burst=_RateLimiter.burst):
+    """
+    Sets how fast yfinance sends requests to Yahoo, shared by all threads.
+    Default is 20 requests per second with bursts of 20. If your session
+    already rate-limits (e.g. requests_ratelimiter), both limits apply, so
+    consider disabling this one.
+    :param rate: Requests per second, None to not pace requests. Backing off
+        when Yahoo answers 429 still applies.
+    :param burst: Requests that can be sent at once before pacing starts
+    :return: None
+    """
+    if rate is not None and rate <= 0:
+        raise ValueError(f"rate must be positive or None, not {rate}")
+    if burst < 1:
+        raise ValueError(f"burst must be at least 1, not {burst}")
+    YfData()._rate_limiter.configure(rate, burst)
+
+
 class YfData(metaclass=SingletonMeta):
     """
     Have one place to retrieve data from Yahoo API in order to ease caching and speed up operations.
@@ -85,8 +190,21 @@ class YfData(metaclass=SingletonMeta):
         # self._cookie_strategy = 'csrf'
 
         self._cookie_lock = threading.Lock()
+        # Published credentials, None until fetched or after invalidation
+        self._credentials = None
+        self._credentials_generation = 0
+        # Newest generation already invalidated, so stale reports are ignored
+        self._invalidated_generation = 0
+
+        # Single-flight: identical fetches in progress, keyed by _request_key()
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
 
-    def _set_session(self, session):
+        self._response_cache = cache.get_response_cache()
+
+        self._rate_limiter = _RateLimiter()
+
+    def _set_session(self, session=None):
         if session is None:
             return
         with self._cookie_lock:
@@ -109,6 +227,7 @@ class YfData(metaclass=SingletonMeta):
                 self._cookie_strategy = 'csrf'
             self._cookie = None
             self._crumb = None
+            self._credentials = None
         except Exception:
             self._cookie_lock.release()
             raise
@@ -306,11 +425,23 @@ class YfData(metaclass=SingletonMeta):
 
     @utils.log_indent_decorator
     def _get_cookie_and_crumb(self, proxy=None, timeout=30):
-        cookie, crumb, strategy = None, None, None
+        credentials = self._get_credentials(proxy, timeout)
+        return credentials.cookie, credentials.crumb, credentials.strategy
 
-        utils.get_yf_logger().debug(f"cookie_mode = '{self._cookie_strategy}'")
+    def _get_credentials(self, proxy=None, timeout=30):
+        # Fast path: no lock once credentials are published
+        credentials = self._credentials
+        if credentials is not None:
+            return credentials
 
         with self._cookie_lock:
+            # Another thread may have fetched them while we waited
+            if self._credentials is not None:
+                return self._credentials
+
+            utils.get_yf_logger().debug(f"cookie_mode = '{self._cookie_strategy}'")
+
+            cookie, crumb = None, None
             if self._cookie_strategy == 'csrf':
                 crumb = self._get_crumb_csrf()
                 if crumb is None:
@@ -324,11 +455,79 @@ class YfData(metaclass=SingletonMeta):
                     # Fail
                     self._set_cookie_strategy('csrf', have_lock=True)
                     crumb = self._get_crumb_csrf()
-            strategy = self._cookie_strategy
-        return cookie, crumb, strategy
+
+            self._credentials_generation += 1
+            credentials = _Credentials(cookie, crumb, self._cookie_strategy, self._credentials_generation)
+            if crumb is not None:
+                # Only publish working credentials, else next caller retries
+                self._credentials = credentials
+            return credentials
+
+    def _invalidate_credentials(self, generation):
+        # Yahoo rejected credentials of 'generation'. Only the first thread to
+        # report it switches strategy, the rest just pick up the replacement.
+        with self._cookie_lock:
+            if generation < self._credentials_generation or generation <= self._invalidated_generation:
+                # Already replaced, or another thread is replacing them
+                return
+            self._invalidated_generation = generation
+            utils.get_yf_logger().debug(f'invalidating credentials generation {generation}')
+            if self._cookie_strategy == 'basic':
+                self._set_cookie_strategy('csrf', have_lock=True)
+            else:
+                self._set_cookie_strategy('basic', have_lock=True)
+
+    @staticmethod
+    def _request_key(url, user_agent_headers, params, proxy):
+        # Requests are identical if they would put the same bytes on the wire
+        params = tuple(sorted((k, str(v)) for k, v in params.items())) if params else ()
+        headers = tuple(sorted(user_agent_headers.items())) if user_agent_headers else ()
+        if isinstance(proxy, dict):
+            proxy = tuple(sorted(proxy.items()))
+        return url, params, headers, proxy
+
+    def _single_flight(self, key, fn):
+        # First caller for 'key' runs fn(), concurrent callers with
+        # same key wait for it and receive the same result.
+        with self._inflight_lock:
+            inflight = self._inflight.get(key)
+            is_leader = inflight is None
+            if is_leader:
+                inflight = _InflightRequest()
+                self._inflight[key] = inflight
+
+        if not is_leader:
+            utils.get_yf_logger().debug(f'waiting for identical in-flight request: {key[0]} {key[1]}')
+            inflight.done.wait()
+            if inflight.exception is not None:
+                raise inflight.exception
+            return inflight.result
+
+        try:
+            inflight.result = fn()
+        except Exception as e:
+            inflight.exception = e
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+            inflight.done.set()
+        return inflight.result
 
     @utils.log_indent_decorator
     def get(self, url, user_agent_headers=None, params=None, proxy=None, timeout=30):
+        # Coalesce concurrent identical GETs (e.g. several threads fetching same
+        # symbol's timezone): first caller fetches, the others wait and share its response.
+        def _fetch():
+            response = self._get(url, user_agent_headers, params, proxy, timeout)
+            # Read body now, so followers never race on the response stream
+            response.content
+            return response
+
+        key = ('get',) + self._request_key(url, user_agent_headers, params, proxy)
+        return self._single_flight(key, _fetch)
+
+    def _get(self, url, user_agent_headers=None, params=None, proxy=None, timeout=30):
         # Important: treat input arguments as immutable.
 
         if len(url) > 200:
@@ -343,44 +542,91 @@ class YfData(metaclass=SingletonMeta):
         if 'crumb' in params:
             raise Exception("Don't manually add 'crumb' to params dict, let data.py handle it")
 
-        cookie, crumb, strategy = self._get_cookie_and_crumb()
-        if crumb is not None:
-            crumbs = {'crumb': crumb}
-        else:
-            crumbs = {}
-        if strategy == 'basic' and cookie is not None:
-            # Basic cookie strategy adds cookie to GET parameters
-            cookies = {cookie.name: cookie.value}
-        else:
-            cookies = None
+        credentials = self._get_credentials(proxy, timeout)
 
         request_args = {
             'url': url,
-            'params': {**params, **crumbs},
-            'cookies': cookies,
+            'params': {**params},
             'proxies': proxy,
             'timeout': timeout,
             'headers': user_agent_headers or self.user_agent_headers
         }
-        response = self._session.get(**request_args)
-        if response.status_code >= 400:
-            # Retry with other cookie strategy
-            if strategy == 'basic':
-                self._set_cookie_strategy('csrf')
-            else:
-                self._set_cookie_strategy('basic')
-            cookie, crumb, strategy = self._get_cookie_and_crumb(proxy, timeout)
-            request_args['params']['crumb'] = crumb
-            if strategy == 'basic':
-                request_args['cookies'] = {cookie.name: cookie.value}
-            response = self._session.get(**request_args)
+        response = self._send(self._add_credentials(request_args, credentials))
+        if response.status_code in (401, 403):
+            # Crumb rejected: refresh once (with other cookie strategy) and retry
+            self._invalidate_credentials(credentials.generation)
+            credentials = self._get_credentials(proxy, timeout)
+            response = self._send(self._add_credentials(request_args, credentials))
+
+        return response
 
+    # Retry 429 and transient server errors
+    _retry_statuses = (429, 500, 502, 503, 504)
+    max_retries = 4
+
+    def _send(self, request_args):
+        # GET through the rate limiter, backing off on throttling
+        for attempt in range(self.max_retries + 1):
+            wait = self._rate_limiter.reserve()
+            if wait > 0:
+                time.sleep(wait)
+            response = self._session.get(**request_args)
+            if response.status_code not in self._retry_statuses:
+                self._rate_limiter.on_success()
+                return response
+
+            retry_after = None
+            if response.status_code == 429:
+                retry_after = self._rate_limiter.parse_retry_after(response.headers.get('Retry-After'))
+                self._rate_limiter.on_throttled(retry_after)
+            if attempt == self.max_retries:
+                break
+            delay = retry_after if retry_after is not None else self._rate_limiter.backoff(attempt)
+            utils.get_yf_logger().debug(f'HTTP {response.status_code}, retrying in {delay:.1f}s')
+            time.sleep(delay)
         return response
 
-    @lru_cache_freezeargs
-    @lru_cache(maxsize=cache_maxsize)
-    def cache_get(self, url, user_agent_headers=None, params=None, proxy=None, timeout=30):
-        return self.get(url, user_agent_headers, params, proxy, timeout)
+    @staticmethod
+    def _add_credentials(request_args, credentials):
+        request_args = {**request_args, 'params': {**request_args['params']}, 'cookies': None}
+        if credentials.crumb is not None:
+            request_args['params']['crumb'] = credentials.crumb
+        if credentials.strategy == 'basic' and credentials.cookie is not None:
+            # Basic cookie strategy adds cookie to GET parameters
+            request_args['cookies'] = {credentials.cookie.name: credentials.cookie.value}
+        return request_args
+
+    def _cache_get(self, kind, url, user_agent_headers=None, params=None, proxy=None, timeout=30):
+        key = (kind,) + self._request_key(url, user_agent_headers, params, proxy)
+        value = self._response_cache.lookup(key)
+        if value is not None:
+            return value
+
+        def _fetch():
+            response = self.get(url, user_agent_headers, params, proxy, timeout)
+            if "Will be right back" in response.text:
+                raise RuntimeError("*** YAHOO! FINANCE IS CURRENTLY DOWN! ***\n"
+                                   "Our engineers are working quickly to resolve "
+                                   "the issue. Thank you for your patience.")
+            value = utils.json_loads(response.content) if kind == 'json' else response.text
+            if response.status_code < 400:
+                ttl = self._response_cache.ttl_for(url)
+                nbytes = self._response_cache.estimate_nbytes(kind, response.content, value)
+                self._response_cache.store(key, value, nbytes, ttl)
+            return value
+
+        # Also coalesce the decode, so concurrent callers share one parsed payload
+        return self._single_flight(key, _fetch)
+
+    def cache_get_raw_json(self, url, user_agent_headers=None, params=None, proxy=None, timeout=30):
+        # Decoded JSON, through the response cache. Result is shared: don't modify.
+        return self._cache_get('json', url, user_agent_headers, params, proxy, timeout)
+
+    def cache_get_text(self, url, user_agent_headers=None, params=None, proxy=None, timeout=30):
+        return self._cache_get('text', url, user_agent_headers, params, proxy, timeout)
+
+    def cache_info(self):
+        return self._response_cache.info()
 
     def _get_proxy(self, proxy):
         # setup proxy in requests format
@@ -394,4 +640,4 @@ class YfData(metaclass=SingletonMeta):
         utils.get_yf_logger().debug(f'get_raw_json(): {url}')
         response = self.get(url, user_agent_headers=user_agent_headers, params=params, proxy=proxy, timeout=timeout)
         response.raise_for_status()
-        return response.json()
+        return utils.json_loads(response.content)
@@ -6,6 +6,12 @@ class YFinanceDataException(YFinanceException):
     pass
 
 
+class YFRateLimitError(YFinanceException):
+    def __init__(self, retry_in):
+        super().__init__(f"Yahoo is rate-limiting requests, stopped sending for {retry_in:.0f} seconds")
+        self.retry_in = retry_in
+
+
 class YFNotImplementedError(NotImplementedError):
     def __init__(self, method_name):
         super().__init__(f"Have not implemented fetching '{method_name}' from Yahoo API")
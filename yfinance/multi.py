@@ -21,15 +21,19 @@
 
 from __future__ import print_function
 
+import concurrent.futures as _futures
+import itertools as _itertools
 import logging
+import os as _os
 import time as _time
 import traceback
 
-import multitasking as _multitasking
+import numpy as _np
 import pandas as _pd
 
 from . import Ticker, utils
 from .data import YfData
+from .const import _BASE_URL_
 from . import shared
 
 
@@ -37,7 +41,8 @@ from . import shared
 def download(tickers, start=None, end=None, actions=False, threads=True, ignore_tz=None,
              group_by='column', auto_adjust=False, back_adjust=False, repair=False, keepna=False,
              progress=True, period="max", show_errors=None, interval="1d", prepost=False,
-             proxy=None, rounding=False, timeout=10, session=None):
+             proxy=None, rounding=False, timeout=10, session=None, batch=False, deadline=None,
+             layout='wide', dtype_profile=None, store=False):
     """Download yahoo tickers
     :Parameters:
         tickers : str, list
@@ -88,9 +93,33 @@ def download(tickers, start=None, end=None, actions=False, threads=True, ignore_
             seconds. (Can also be a fraction of a second e.g. 0.01)
         session: None or Session
             Optional. Pass your own session object to be used for all requests
+        batch: bool / int
+            Fetch many symbols per request from Yahoo's spark endpoint,
+            in chunks of 'batch' symbols (True = 20). Only for intervals
+            1d,1wk,1mo without repair, actions, auto_adjust or back_adjust,
+            else ignored. Spark returns unadjusted closing prices only, so
+            Open/High/Low are NaN, Volume is 0 and there is no 'Adj Close'.
+            Default is False
+        deadline: None or float
+            Optional. Seconds the whole download may take. Tickers not
+            fetched by then are cancelled and reported as failed, the
+            rest are returned. Default is None (wait for all)
+        layout: str
+            'wide' (default): one column per (field, ticker), see group_by.
+            'long': one row per (ticker, date), with 'Symbol' & date
+            columns. Uses less memory when tickers' dates barely overlap.
+        dtype_profile: str
+            'default' or 'compact' (float32 prices, sparse actions),
+            see Ticker.history(). Default is 'compact' for layout='long',
+            else 'default'
+        store: bool
+            Read & write prices in local store, see Ticker.history().
+            Disables 'batch'. Default is False
     """
     logger = utils.get_yf_logger()
 
+    dtype_profile = _layout_dtype_profile(layout, dtype_profile)
+
     if show_errors is not None:
         if show_errors:
             utils.print_once(f"yfinance: download(show_errors={show_errors}) argument is deprecated and will be removed in future version. Do this instead: logging.getLogger('yfinance').setLevel(logging.ERROR)")
@@ -118,86 +147,190 @@ def download(tickers, start=None, end=None, actions=False, threads=True, ignore_
         else:
             ignore_tz = True
 
+    tickers, isins = _normalise_tickers(tickers, proxy, session)
+
+    results = shared.DownloadResults()
+    results.isins = isins
+    if progress:
+        results.progress_bar = utils.ProgressBar(len(tickers), 'completed')
+
+    # Ensure data initialised with session.
+    YfData(session=session)
+
+    if deadline is not None:
+        deadline = _time.monotonic() + deadline
+
+    jobs, failed, threads = _build_jobs(tickers, batch, threads, period=period, interval=interval,
+                                        start=start, end=end, prepost=prepost,
+                                        actions=actions, auto_adjust=auto_adjust,
+                                        back_adjust=back_adjust, repair=repair, keepna=keepna,
+                                        proxy=proxy, rounding=rounding, timeout=timeout,
+                                        dtype_profile=dtype_profile, store=store)
+    for ticker, e in failed.items():
+        results.dfs[ticker] = utils.empty_df()
+        results.errors[ticker] = repr(e)
+        if progress:
+            results.progress_bar.animate()
+
+    for job_tickers, future in _run_jobs(jobs, threads, deadline):
+        _store_job_result(results, job_tickers, future)
+        if progress:
+            for _ in job_tickers:
+                results.progress_bar.animate()
+
+    if progress:
+        results.progress_bar.completed()
+
+    _log_errors(results.errors, results.tracebacks)
+
+    return _combine_dfs(results.dfs, tickers, results.isins, ignore_tz, group_by, layout)
+
+
+# Yahoo's multi-symbol chart endpoint
+_SPARK_INTERVALS = ('1d', '1wk', '1mo')
+_SPARK_MAX_SYMBOLS = 20
+
+
+def download_iter(tickers, start=None, end=None, actions=False, threads=True, ignore_tz=None,
+                  auto_adjust=False, back_adjust=False, repair=False, keepna=False,
+                  period="max", interval="1d", prepost=False,
+                  proxy=None, rounding=False, timeout=10, session=None, batch=False, deadline=None,
+                  dtype_profile='default', store=False):
+    """Download yahoo tickers, yielding each ticker as soon as it is fetched.
+    Only a few tickers are in flight at once and nothing is kept after
+    being yielded, so memory use doesn't grow with number of tickers.
+    :Parameters:
+        Same as download(), except 'group_by' & 'progress' don't apply
+    :Yields:
+        (symbol, DataFrame, error) in order of completion. If fetch
+        failed, DataFrame is empty and error is the exception, else None.
+    """
+    logger = utils.get_yf_logger()
+    utils.check_dtype_profile(dtype_profile)
+
+    if logger.isEnabledFor(logging.DEBUG) and threads:
+        logger.debug('Disabling multithreading because DEBUG logging enabled')
+        threads = False
+
+    if ignore_tz is None:
+        # Set default value depending on interval
+        ignore_tz = interval[1:] not in ['m', 'h']
+
+    tickers, isins = _normalise_tickers(tickers, proxy, session)
+
+    # Ensure data initialised with session.
+    YfData(session=session)
+
+    if deadline is not None:
+        deadline = _time.monotonic() + deadline
+
+    jobs, failed, threads = _build_jobs(tickers, batch, threads, period=period, interval=interval,
+                                        start=start, end=end, prepost=prepost,
+                                        actions=actions, auto_adjust=auto_adjust,
+                                        back_adjust=back_adjust, repair=repair, keepna=keepna,
+                                        proxy=proxy, rounding=rounding, timeout=timeout,
+                                        dtype_profile=dtype_profile, store=store)
+    for ticker, e in failed.items():
+        yield isins.get(ticker, ticker), utils.empty_df(), e
+
+    for job_tickers, future in _run_jobs(jobs, threads, deadline):
+        results = shared.DownloadResults()
+        _store_job_result(results, job_tickers, future, keep_exceptions=True)
+        for ticker in job_tickers:
+            df = results.dfs[ticker]
+            error = results.errors.get(ticker)
+            if error is not None:
+                logger.debug(f'{ticker}: {results.tracebacks.get(ticker, error)}')
+            elif ignore_tz and df.shape[0] > 0:
+                df.index = df.index.tz_localize(None)
+            yield isins.get(ticker, ticker), df, error
+
+
+def _build_jobs(tickers, batch, threads, period="max", interval="1d", start=None, end=None,
+                prepost=False, actions=False, auto_adjust=False, back_adjust=False,
+                repair=False, keepna=False, proxy=None, rounding=False, timeout=10,
+                dtype_profile='default', store=False):
+    # Split download into jobs for _run_jobs(): one per ticker, or one per spark chunk.
+    # Returns (jobs, {ticker: exception} of tickers failed already, worker count)
+    if batch and (interval not in _SPARK_INTERVALS or repair or actions or auto_adjust or back_adjust):
+        # Spark has no adjusted closes, so can't adjust
+        utils.get_yf_logger().debug('Batch download only for intervals %s without repair, actions or adjusting, fetching per-ticker' % ','.join(_SPARK_INTERVALS))
+        batch = False
+    if batch and store:
+        utils.get_yf_logger().debug('Batch download does not use price store, fetching per-ticker')
+        batch = False
+
+    failed = {}
+    if batch:
+        batch_size = _SPARK_MAX_SYMBOLS if batch is True else int(batch)
+        chunks, failed = _batch_chunks(tickers, batch_size, period=period, interval=interval,
+                                       start=start, end=end, prepost=prepost, proxy=proxy, timeout=timeout)
+        jobs = [([tkr.ticker for tkr, _ in chunk], _download_chunk,
+                 dict(chunk=chunk, request_params=request_params,
+                      auto_adjust=auto_adjust, back_adjust=back_adjust,
+                      keepna=keepna, proxy=proxy, rounding=rounding, timeout=timeout,
+                      dtype_profile=dtype_profile))
+                for request_params, chunk in chunks]
+    else:
+        jobs = [([ticker], _download_one,
+                 dict(ticker=ticker, period=period, interval=interval,
+                      start=start, end=end, prepost=prepost,
+                      actions=actions, auto_adjust=auto_adjust,
+                      back_adjust=back_adjust, repair=repair, keepna=keepna,
+                      proxy=proxy, rounding=rounding, timeout=timeout,
+                      dtype_profile=dtype_profile, store=store))
+                for ticker in tickers]
+
+    if threads is True:
+        threads = min([len(jobs), _cpu_count() * 2])
+    return jobs, failed, threads
+
+
+def _normalise_tickers(tickers, proxy=None, session=None):
     # create ticker list
     tickers = tickers if isinstance(
         tickers, (list, set, tuple)) else tickers.replace(',', ' ').split()
 
     # accept isin as ticker
-    shared._ISINS = {}
+    isins = {}
     _tickers_ = []
     for ticker in tickers:
         if utils.is_isin(ticker):
             isin = ticker
             ticker = utils.get_ticker_by_isin(ticker, proxy, session=session)
-            shared._ISINS[ticker] = isin
+            isins[ticker] = isin
         _tickers_.append(ticker)
 
     tickers = _tickers_
 
     tickers = list(set([ticker.upper() for ticker in tickers]))
 
-    if progress:
-        shared._PROGRESS_BAR = utils.ProgressBar(len(tickers), 'completed')
-
-    # reset shared._DFS
-    shared._DFS = {}
-    shared._ERRORS = {}
-    shared._TRACEBACKS = {}
-
-    # Ensure data initialised with session.
-    YfData(session=session)
+    return tickers, isins
 
-    # download using threads
-    if threads:
-        if threads is True:
-            threads = min([len(tickers), _multitasking.cpu_count() * 2])
-        _multitasking.set_max_threads(threads)
-        for i, ticker in enumerate(tickers):
-            _download_one_threaded(ticker, period=period, interval=interval,
-                                   start=start, end=end, prepost=prepost,
-                                   actions=actions, auto_adjust=auto_adjust,
-                                   back_adjust=back_adjust, repair=repair, keepna=keepna,
-                                   progress=(progress and i > 0), proxy=proxy,
-                                   rounding=rounding, timeout=timeout)
-        while len(shared._DFS) < len(tickers):
-            _time.sleep(0.01)
-    # download synchronously
-    else:
-        for i, ticker in enumerate(tickers):
-            data = _download_one(ticker, period=period, interval=interval,
-                                 start=start, end=end, prepost=prepost,
-                                 actions=actions, auto_adjust=auto_adjust,
-                                 back_adjust=back_adjust, repair=repair, keepna=keepna,
-                                 proxy=proxy,
-                                 rounding=rounding, timeout=timeout)
-            if progress:
-                shared._PROGRESS_BAR.animate()
-    
-    if progress:
-        shared._PROGRESS_BAR.completed()
 
-    if shared._ERRORS:
+def _log_errors(errors, tracebacks):
+    if errors:
         # Send errors to logging module
         logger = utils.get_yf_logger()
         logger.error('\n%.f Failed download%s:' % (
-            len(shared._ERRORS), 's' if len(shared._ERRORS) > 1 else ''))
+            len(errors), 's' if len(errors) > 1 else ''))
 
         # Log each distinct error once, with list of symbols affected
-        errors = {}
-        for ticker in shared._ERRORS:
-            err = shared._ERRORS[ticker]
+        errs = {}
+        for ticker in errors:
+            err = errors[ticker]
             err = err.replace(f'{ticker}', '%ticker%')
-            if err not in errors:
-                errors[err] = [ticker]
+            if err not in errs:
+                errs[err] = [ticker]
             else:
-                errors[err].append(ticker)
-        for err in errors.keys():
-            logger.error(f'{errors[err]}: ' + err)
+                errs[err].append(ticker)
+        for err in errs.keys():
+            logger.error(f'{errs[err]}: ' + err)
 
         # Log each distinct traceback once, with list of symbols affected
         tbs = {}
-        for ticker in shared._TRACEBACKS:
-            tb = shared._TRACEBACKS[ticker]
+        for ticker in tracebacks:
+            tb = tracebacks[ticker]
             tb = tb.replace(f'{ticker}', '%ticker%')
             if tb not in tbs:
                 tbs[tb] = [ticker]
@@ -206,90 +339,316 @@ def download(tickers, start=None, end=None, actions=False, threads=True, ignore_
         for tb in tbs.keys():
             logger.debug(f'{tbs[tb]}: ' + tb)
 
+
+def _layout_dtype_profile(layout, dtype_profile):
+    # Long layout exists to save memory, so compact dtypes unless asked otherwise
+    if layout not in ('wide', 'long'):
+        raise ValueError(f"layout='{layout}' must be 'wide' or 'long'")
+    if dtype_profile is None:
+        dtype_profile = 'compact' if layout == 'long' else 'default'
+    utils.check_dtype_profile(dtype_profile)
+    return dtype_profile
+
+
+def _combine_dfs(dfs, tickers, isins, ignore_tz, group_by, layout='wide'):
+    # Combine per-ticker frames into the DataFrame returned by download()
     if ignore_tz:
-        for tkr in shared._DFS.keys():
-            if (shared._DFS[tkr] is not None) and (shared._DFS[tkr].shape[0] > 0):
-                shared._DFS[tkr].index = shared._DFS[tkr].index.tz_localize(None)
+        for tkr in dfs.keys():
+            if (dfs[tkr] is not None) and (dfs[tkr].shape[0] > 0):
+                dfs[tkr].index = dfs[tkr].index.tz_localize(None)
+
+    if layout == 'long':
+        return _assemble_long(dfs, isins)
 
     if len(tickers) == 1:
         ticker = tickers[0]
-        return shared._DFS[ticker]
+        return dfs[ticker]
 
-    try:
-        data = _pd.concat(shared._DFS.values(), axis=1, sort=True,
-                          keys=shared._DFS.keys())
-    except Exception:
-        _realign_dfs()
-        data = _pd.concat(shared._DFS.values(), axis=1, sort=True,
-                          keys=shared._DFS.keys())
+    return _assemble_panel(dfs, isins, group_by)
 
-    # switch names back to isins if applicable
-    data.rename(columns=shared._ISINS, inplace=True)
 
-    if group_by == 'column':
-        data.columns = data.columns.swaplevel(0, 1)
-        data.sort_index(level=0, axis=1, inplace=True)
+def _assemble_panel(dfs, isins, group_by):
+    # Build the wide (field, ticker) frame in one preallocated array:
+    # union index computed once, each ticker's values scattered into
+    # place with searchsorted. Avoids pd.concat re-aligning every frame.
+    frames = [(isins.get(t, t), df) for t, df in dfs.items()]
+    nonempty = [df for _, df in frames if df.shape[0] > 0]
 
-    return data
+    # Union index, on int64 nanoseconds (UTC if tz-aware)
+    tzs = {df.index.tz for df in nonempty}
+    if nonempty:
+        index_i8 = _np.unique(_np.concatenate([df.index.asi8 for df in nonempty]))
+    else:
+        index_i8 = _np.array([], dtype=_np.int64)
+    index = _pd.DatetimeIndex(index_i8.view('datetime64[ns]'))
+    if tzs != {None}:
+        # Different exchange timezones align in UTC, same as concat
+        tz = tzs.pop() if len(tzs) == 1 else 'UTC'
+        index = index.tz_localize('UTC').tz_convert(tz)
+    if nonempty:
+        index.name = nonempty[0].index.name
+    else:
+        index.name = frames[0][1].index.name
 
+    # Column layout: only (field, ticker) pairs that exist
+    columns = [(f, t) for t, df in frames for f in df.columns]
+    if group_by == 'column':
+        columns = sorted(columns)
+    else:
+        columns = [(t, f) for f, t in columns]
+    col_pos = {c: i for i, c in enumerate(columns)}
+
+    block = _np.full((len(index_i8), len(columns)), _np.nan)
+    dtypes = {}
+    for t, df in frames:
+        keys = [(f, t) if group_by == 'column' else (t, f) for f in df.columns]
+        for k, dt in zip(keys, df.dtypes):
+            dtypes.setdefault(k, set()).add(dt)
+        if df.shape[0] == 0:
+            continue
+        rows = _np.searchsorted(index_i8, df.index.asi8)
+        cols = _np.array([col_pos[k] for k in keys])
+        block[rows[:, None], cols[None, :]] = df.to_numpy(dtype=float, na_value=_np.nan)
+
+    data = _pd.DataFrame(block, index=index, columns=_pd.MultiIndex.from_tuples(columns), copy=False)
+
+    # Restore integer & bool columns where no gaps were introduced,
+    # and float32 columns (dtype_profile='compact')
+    nans = _np.isnan(block).any(axis=0)
+    restore = {}
+    for k, dts in dtypes.items():
+        if len(dts) != 1:
+            continue
+        dt = next(iter(dts))
+        if isinstance(dt, _pd.SparseDtype):
+            dt = dt.subtype
+        if _pd.api.types.is_integer_dtype(dt) or _pd.api.types.is_bool_dtype(dt):
+            if not nans[col_pos[k]]:
+                restore[k] = dt
+        elif dt == _np.float32:
+            restore[k] = dt
+    if restore:
+        data = data.astype(restore)
 
-def _realign_dfs():
-    idx_len = 0
-    idx = None
+    return data
 
-    for df in shared._DFS.values():
-        if len(df) > idx_len:
-            idx_len = len(df)
-            idx = df.index
 
-    for key in shared._DFS.keys():
+def _assemble_long(dfs, isins):
+    # Stack per-ticker frames into one long frame. Each column is built
+    # with a single np.concatenate, so memory scales with rows actually
+    # returned, and per-ticker dtypes (e.g. int Volume) survive.
+    frames = sorted((isins.get(t, t), df) for t, df in dfs.items())
+    nonempty = [df for _, df in frames if df.shape[0] > 0]
+    index_name = nonempty[0].index.name if nonempty else 'Date'
+
+    # Datetime column: tz kept if all tickers share one, else UTC
+    tzs = {df.index.tz for df in nonempty}
+    tz = None
+    if tzs != {None}:
+        tz = tzs.pop() if len(tzs) == 1 else 'UTC'
+    if nonempty:
+        dt_i8 = _np.concatenate([df.index.asi8 for df in nonempty])
+    else:
+        dt_i8 = _np.array([], dtype=_np.int64)
+    dt = _pd.DatetimeIndex(dt_i8.view('datetime64[ns]'))
+    if tz is not None:
+        dt = dt.tz_localize('UTC').tz_convert(tz)
+
+    symbols = [t for t, _ in frames]
+    lengths = [df.shape[0] for _, df in frames]
+    codes = _np.repeat(_np.arange(len(symbols), dtype=_np.int32), lengths)
+    data = {'Symbol': _pd.Categorical.from_codes(codes, categories=symbols),
+            index_name: dt}
+
+    fields = []
+    for df in nonempty:
+        fields += [c for c in df.columns if c not in fields]
+    for f in fields:
+        parts = []
+        for df in nonempty:
+            if f in df.columns:
+                col = df[f]
+                # Sparse actions (dtype_profile='compact') are densified, keep their subtype
+                dtype = col.dtype.subtype if isinstance(col.dtype, _pd.SparseDtype) else None
+                parts.append(col.to_numpy(dtype=dtype))
+            else:
+                parts.append(_np.full(df.shape[0], _np.nan))
+        data[f] = _np.concatenate(parts)
+
+    return _pd.DataFrame(data)
+
+
+def _batch_chunks(tickers, batch_size, period="max", interval="1d",
+                  start=None, end=None, prepost=False, proxy=None, timeout=10):
+    # Build each ticker's history request, then group tickers with
+    # identical request parameters (i.e. same timezone) into chunks.
+    # Returns (chunks, {ticker: exception} of tickers without timezone)
+    tkrs = [Ticker(ticker) for ticker in tickers]
+    tzs = [None] * len(tkrs)
+    if start or (end is not None and (period is None or period.lower() == "max")):
+        # Date range is relative to exchange timezone. Cold tz cache =
+        # one request per symbol, so look them up in parallel.
+        with _futures.ThreadPoolExecutor(max_workers=min(len(tkrs), _cpu_count() * 2) or 1,
+                                         thread_name_prefix='yfinance') as executor:
+            tzs = list(executor.map(lambda tkr: tkr._get_ticker_tz(proxy, timeout), tkrs))
+    # Else a period, or full history sent as range=max: no timezone needed
+
+    groups = {}
+    failed = {}
+    for tkr, tz in zip(tkrs, tzs):
+        request = tkr._build_history_request(period, interval, start, end, prepost, tz, range_max=True)
+        if request is None:
+            failed[tkr.ticker] = Exception(f'{tkr.ticker}: No timezone found, symbol may be delisted')
+            continue
+        key = tuple(sorted(request["params"].items()))
+        groups.setdefault(key, []).append((tkr, request))
+
+    chunks = []
+    for group in groups.values():
+        for i in range(0, len(group), batch_size):
+            chunks.append((dict(group[i][1]["params"]), group[i:i + batch_size]))
+    return chunks, failed
+
+
+def _download_chunk(chunk, request_params, auto_adjust=False, back_adjust=False,
+                    keepna=False, proxy=None, rounding=False, timeout=10, dtype_profile='default'):
+    # Fetch closing prices of all symbols in chunk with one spark request,
+    # then run each symbol's slice through the normal history() processing.
+    # Returns {ticker: DataFrame or (exception, traceback)}
+    params = {k: v for k, v in request_params.items() if k != "events"}
+    params["symbols"] = ",".join(tkr.ticker for tkr, _ in chunk)
+    responses = {}
+    response = YfData().get(url=f"{_BASE_URL_}/v7/finance/spark", params=params,
+                            proxy=proxy, timeout=timeout)
+    for r in utils.json_loads(response.content)["spark"]["result"] or []:
+        if r.get("response"):
+            responses[r["symbol"].upper()] = r["response"][0]
+
+    out = {}
+    for tkr, request in chunk:
+        ticker = tkr.ticker
         try:
-            shared._DFS[key] = _pd.DataFrame(
-                index=idx, data=shared._DFS[key]).drop_duplicates()
-        except Exception:
-            shared._DFS[key] = _pd.concat([
-                utils.empty_df(idx), shared._DFS[key].dropna()
-            ], axis=0, sort=True)
-
-        # remove duplicate index
-        shared._DFS[key] = shared._DFS[key].loc[
-            ~shared._DFS[key].index.duplicated(keep='last')]
-
-
-@_multitasking.task
-def _download_one_threaded(ticker, start=None, end=None,
-                           auto_adjust=False, back_adjust=False, repair=False,
-                           actions=False, progress=True, period="max",
-                           interval="1d", prepost=False, proxy=None,
-                           keepna=False, rounding=False, timeout=10):
-    data = _download_one(ticker, start, end, auto_adjust, back_adjust, repair,
-                         actions, period, interval, prepost, proxy, rounding,
-                         keepna, timeout)
-    if progress:
-        shared._PROGRESS_BAR.animate()
+            result = responses.get(ticker)
+            data = None
+            if result is not None:
+                # Spark only has closing prices, fill other columns with NaN
+                quote = result["indicators"]["quote"][0]
+                n = len(result.get("timestamp", []))
+                for k in ("open", "high", "low", "volume"):
+                    if k not in quote:
+                        quote[k] = [_np.nan] * n
+                data = {"chart": {"result": [result], "error": None}}
+            df, _, _ = tkr._process_history_data(data, request, actions=False,
+                                                 auto_adjust=auto_adjust, back_adjust=back_adjust,
+                                                 repair=False, keepna=keepna, rounding=rounding,
+                                                 raise_errors=True, dtype_profile=dtype_profile)
+            # Without adjclose, 'Adj Close' would just be a copy of 'Close'
+            out[ticker] = df.drop(columns="Adj Close", errors="ignore")
+        except Exception as e:
+            out[ticker] = (e, traceback.format_exc())
+    return out
 
 
 def _download_one(ticker, start=None, end=None,
                   auto_adjust=False, back_adjust=False, repair=False,
                   actions=False, period="max", interval="1d",
                   prepost=False, proxy=None, rounding=False,
-                  keepna=False, timeout=10):
-    data = None
+                  keepna=False, timeout=10, dtype_profile='default', store=False):
+    return Ticker(ticker).history(
+            period=period, interval=interval,
+            start=start, end=end, prepost=prepost,
+            actions=actions, auto_adjust=auto_adjust,
+            back_adjust=back_adjust, repair=repair, proxy=proxy,
+            rounding=rounding, keepna=keepna, timeout=timeout,
+            raise_errors=True, dtype_profile=dtype_profile, store=store
+    )
+
+
+def _run_jobs(jobs, threads, deadline=None):
+    # Run each (tickers, fn, kwargs) job, yield (tickers, future) as each completes.
+    # With threads, jobs run in a thread pool. Once 'deadline' (time.monotonic())
+    # passes, unfinished jobs are cancelled and yielded with future=None.
+    if not threads:
+        for job_tickers, fn, kwargs in jobs:
+            if deadline is not None and _time.monotonic() >= deadline:
+                yield job_tickers, None
+                continue
+            future = _futures.Future()
+            try:
+                future.set_result(fn(**kwargs))
+            except Exception as e:
+                future.set_exception(e)
+            yield job_tickers, future
+        return
+
+    # Only keep a few jobs queued ahead of the workers, so finished frames
+    # are consumed before more are fetched
+    jobs = iter(jobs)
+    max_in_flight = 2 * threads
+    executor = _futures.ThreadPoolExecutor(max_workers=max(threads, 1), thread_name_prefix='yfinance')
+    pending = {}
+
+    def _submit():
+        for job_tickers, fn, kwargs in _itertools.islice(jobs, max(max_in_flight - len(pending), 0)):
+            pending[executor.submit(fn, **kwargs)] = job_tickers
+
+    try:
+        _submit()
+        while pending:
+            timeout = None if deadline is None else max(0.0, deadline - _time.monotonic())
+            done, _ = _futures.wait(pending, timeout=timeout, return_when=_futures.FIRST_COMPLETED)
+            if not done:
+                # Deadline passed
+                for future, job_tickers in pending.items():
+                    future.cancel()
+                    yield job_tickers, None
+                for job_tickers, _, _ in jobs:
+                    yield job_tickers, None
+                return
+            finished = [(pending.pop(future), future) for future in done]
+            _submit()
+            for job_tickers, future in finished:
+                yield job_tickers, future
+    finally:
+        # Don't wait on requests still stuck past deadline. Cancel queued
+        # jobs here, shutdown(cancel_futures=True) needs Python 3.9
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def _store_job_result(results, job_tickers, future, keep_exceptions=False):
+    # Move outcome of a finished (or cancelled) job into results.
+    # Errors are stored as repr() unless 'keep_exceptions'.
+    fmt = (lambda e: e) if keep_exceptions else repr
+    if future is None:
+        for ticker in job_tickers:
+            results.dfs[ticker] = utils.empty_df()
+            results.errors[ticker] = fmt(TimeoutError(f'download deadline passed before {ticker} was fetched'))
+        return
+
     try:
-        data = Ticker(ticker).history(
-                period=period, interval=interval,
-                start=start, end=end, prepost=prepost,
-                actions=actions, auto_adjust=auto_adjust,
-                back_adjust=back_adjust, repair=repair, proxy=proxy,
-                rounding=rounding, keepna=keepna, timeout=timeout,
-                raise_errors=True
-        )
+        data = future.result()
     except Exception as e:
-        # glob try/except needed as current thead implementation breaks if exception is raised.
-        shared._DFS[ticker.upper()] = utils.empty_df()
-        shared._ERRORS[ticker.upper()] = repr(e)
-        shared._TRACEBACKS[ticker.upper()] = traceback.format_exc()
-    else:
-        shared._DFS[ticker.upper()] = data
+        tb = ''.join(traceback.format_exception(type(e), e, e.__traceback__))
+        for ticker in job_tickers:
+            results.dfs[ticker] = utils.empty_df()
+            results.errors[ticker] = fmt(e)
+            results.tracebacks[ticker] = tb
+        return
+
+    if not isinstance(data, dict):
+        data = {job_tickers[0]: data}
+    for ticker in job_tickers:
+        df = data.get(ticker)
+        if isinstance(df, tuple):
+            e, tb = df
+            results.dfs[ticker] = utils.empty_df()
+            results.errors[ticker] = fmt(e)
+            results.tracebacks[ticker] = tb
+        else:
+            results.dfs[ticker] = df
 
-    return data
+
+def _cpu_count():
+    return _os.cpu_count() or 1
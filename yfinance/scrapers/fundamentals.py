@@ -1,5 +1,4 @@
 import datetime
-import json
 
 import pandas as pd
 
@@ -115,12 +114,11 @@ class Financials:
         url += f"&period1={int(start_dt.timestamp())}&period2={int(end.timestamp())}"
 
         # Step 3: fetch and reshape data
-        json_str = self._data.cache_get(url=url, proxy=proxy).text
-        json_data = json.loads(json_str)
+        json_data = self._data.cache_get_raw_json(url=url, proxy=proxy)
         data_raw = json_data["timeseries"]["result"]
         # data_raw = [v for v in data_raw if len(v) > 1] # Discard keys with no data
-        for d in data_raw:
-            del d["meta"]
+        # Note: 'json_data' is shared through response cache, so filter instead of deleting in-place
+        data_raw = [{k: v for k, v in d.items() if k != "meta"} for d in data_raw]
 
         # Now reshape data into a table:
         # Step 1: get columns and index:
@@ -38,8 +38,8 @@ class Holders:
     def _scrape(self, proxy):
         ticker_url = f"{self._SCRAPE_URL_}/{self._symbol}"
         try:
-            resp = self._data.cache_get(ticker_url + '/holders', proxy=proxy)
-            holders = pd.read_html(StringIO(resp.text))
+            resp = self._data.cache_get_text(ticker_url + '/holders', proxy=proxy)
+            holders = pd.read_html(StringIO(resp))
         except Exception:
             holders = []
 
@@ -75,6 +75,66 @@ class InfoDictWrapper(MutableMapping):
         return k
 
 
+# FastInfo key -> (field in /v7/finance/quote response, scale)
+_FAST_INFO_QUOTE_FIELDS = {
+    "currency": ("currency", None),
+    "quoteType": ("quoteType", None),
+    "exchange": ("exchange", None),
+    "timezone": ("exchangeTimezoneName", None),
+    "shares": ("sharesOutstanding", None),
+    "marketCap": ("marketCap", None),
+    "lastPrice": ("regularMarketPrice", None),
+    "previousClose": ("regularMarketPreviousClose", None),
+    "open": ("regularMarketOpen", None),
+    "dayHigh": ("regularMarketDayHigh", None),
+    "dayLow": ("regularMarketDayLow", None),
+    "regularMarketPreviousClose": ("regularMarketPreviousClose", None),
+    "lastVolume": ("regularMarketVolume", None),
+    "fiftyDayAverage": ("fiftyDayAverage", None),
+    "twoHundredDayAverage": ("twoHundredDayAverage", None),
+    "tenDayAverageVolume": ("averageDailyVolume10Day", None),
+    "threeMonthAverageVolume": ("averageDailyVolume3Month", None),
+    "yearHigh": ("fiftyTwoWeekHigh", None),
+    "yearLow": ("fiftyTwoWeekLow", None),
+    # Yahoo gives percent, FastInfo a fraction
+    "yearChange": ("fiftyTwoWeekChangePercent", 0.01),
+}
+
+_QUOTE_URL_ = "https://query1.finance.yahoo.com/v7/finance/quote"
+_QUOTE_MAX_SYMBOLS = 100
+
+
+def fetch_fast_info_batch(data: YfData, symbols, proxy=None):
+    """
+    FastInfo fields of many symbols from the multi-symbol quote endpoint,
+    one request per 100 symbols. Returns DataFrame indexed by symbol with
+    FastInfo keys as columns, NaN where Yahoo did not return a field.
+    """
+    fields = sorted({f for f, _ in _FAST_INFO_QUOTE_FIELDS.values()})
+    rows = {}
+    for i in range(0, len(symbols), _QUOTE_MAX_SYMBOLS):
+        chunk = symbols[i:i + _QUOTE_MAX_SYMBOLS]
+        params = {"symbols": ",".join(chunk), "fields": ",".join(fields)}
+        try:
+            # Live prices, so bypass response cache
+            response = data.get(url=_QUOTE_URL_, params=params, proxy=proxy)
+            result = utils.json_loads(response.content)["quoteResponse"]["result"] or []
+        except Exception as e:
+            utils.get_yf_logger().error(f"Failed to fetch quotes for {len(chunk)} symbols, reason: {e}")
+            continue
+        for q in result:
+            row = {}
+            for k, (f, scale) in _FAST_INFO_QUOTE_FIELDS.items():
+                v = q.get(f)
+                if v is not None and scale is not None:
+                    v = v * scale
+                row[k] = v
+            rows[q["symbol"].upper()] = row
+
+    df = pd.DataFrame.from_dict(rows, orient="index", columns=list(_FAST_INFO_QUOTE_FIELDS.keys()))
+    return df.reindex([s.upper() for s in symbols])
+
+
 class FastInfo:
     # Contain small subset of info[] items that can be fetched faster elsewhere.
     # Imitates a dict.
@@ -682,8 +742,7 @@ class Quote:
             end = int(end.timestamp())
             url += f"&period1={start}&period2={end}"
 
-            json_str = self._data.cache_get(url=url, proxy=proxy).text
-            json_data = json.loads(json_str)
+            json_data = self._data.cache_get_raw_json(url=url, proxy=proxy)
             try:
                 key_stats = json_data["timeseries"]["result"][0]
                 if k not in key_stats:
@@ -19,8 +19,17 @@
 # limitations under the License.
 #
 
-_DFS = {}
-_PROGRESS_BAR = None
-_ERRORS = {}
-_TRACEBACKS = {}
-_ISINS = {}
+
+
+class DownloadResults:
+    """
+    Results of one download() call. Every call gets its own instance,
+    so concurrent download() calls cannot overwrite each other.
+    """
+
+    def __init__(self, progress_bar=None):
+        self.dfs = {}
+        self.errors = {}
+        self.tracebacks = {}
+        self.isins = {}
+        self.progress_bar = progress_bar
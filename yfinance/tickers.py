@@ -21,7 +21,9 @@
 
 from __future__ import print_function
 
-from . import Ticker, multi
+from . import Ticker, multi, utils
+from .data import YfData
+from .scrapers.quote import fetch_fast_info_batch
 
 
 # from collections import namedtuple as _namedtuple
@@ -80,7 +82,10 @@ class Tickers:
                               **kwargs)
 
         for symbol in self.symbols:
-            self.tickers.get(symbol, {})._history = data[symbol]
+            df = data[symbol]
+            self.tickers.get(symbol, {})._history = df
+            self.tickers.get(symbol, {})._history_factor = \
+                utils.adjustment_factor(df) if "Adj Close" in df.columns else None
 
         if group_by == 'column':
             data.columns = data.columns.swaplevel(0, 1)
@@ -88,5 +93,31 @@ class Tickers:
 
         return data
 
+    @property
+    def fast_info(self):
+        return self.get_fast_info()
+
+    def get_fast_info(self, proxy=None, fallback=True):
+        """
+        FastInfo of all symbols as a DataFrame, one row per symbol.
+        Fetched in bulk from Yahoo's quote endpoint. If 'fallback', fields
+        missing from that are filled from each Ticker's own fast_info,
+        which costs extra requests per affected symbol.
+        """
+        df = fetch_fast_info_batch(YfData(), self.symbols, proxy=proxy)
+        if fallback:
+            for symbol in self.symbols:
+                row = df.loc[symbol]
+                missing = row.index[row.isna()]
+                if len(missing) == 0:
+                    continue
+                fi = self.tickers[symbol].fast_info
+                for k in missing:
+                    try:
+                        df.loc[symbol, k] = fi[k]
+                    except Exception:
+                        pass
+        return df
+
     def news(self):
         return {ticker: [item for item in Ticker(ticker).news] for ticker in self.symbols}
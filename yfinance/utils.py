@@ -46,6 +46,11 @@ try:
 except ImportError:
     import json as _json
 
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
 user_agent_headers = {
     'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_10_1) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/39.0.2171.95 Safari/537.36'}
 
@@ -424,6 +429,25 @@ def _parse_user_dt(dt, exchange_tz):
     return dt
 
 
+def _period_to_start(period, end, exchange_tz):
+    # Epoch start of history() 'period' ending at epoch 'end'.
+    # Approximates Yahoo's 'range' parameter, starting at midnight.
+    if period is None or period.lower() == "max":
+        max_start_datetime = _pd.Timestamp.utcnow().floor("D") - _datetime.timedelta(days=99 * 365)
+        return int(max_start_datetime.timestamp())
+    period = period.lower()
+    end_dt = _pd.Timestamp(end, unit='s', tz="UTC").tz_convert(exchange_tz)
+    if period == "ytd":
+        return int(end_dt.normalize().replace(month=1, day=1).timestamp())
+    m = _re.match(r"^(\d+)(d|wk|mo|y)$", period)
+    if m is None:
+        raise ValueError(f"Invalid period '{period}'")
+    n, unit = int(m.group(1)), m.group(2)
+    delta = {"d": relativedelta(days=n), "wk": relativedelta(weeks=n),
+             "mo": relativedelta(months=n), "y": relativedelta(years=n)}[unit]
+    return int((end_dt - delta).normalize().timestamp())
+
+
 def _interval_to_timedelta(interval):
     if interval == "1mo":
         return relativedelta(months=1)
@@ -437,70 +461,107 @@ def _interval_to_timedelta(interval):
         return _pd.Timedelta(interval)
 
 
-def auto_adjust(data):
-    col_order = data.columns
-    df = data.copy()
-    ratio = (df["Adj Close"] / df["Close"]).to_numpy()
-    df["Adj Open"] = df["Open"] * ratio
-    df["Adj High"] = df["High"] * ratio
-    df["Adj Low"] = df["Low"] * ratio
+def adjustment_factor(data):
+    # Per-row ratio of adjusted to raw price. Raw OHLC * factor = adjusted OHLC.
+    return (data["Adj Close"] / data["Close"]).to_numpy()
 
-    df.drop(
-        ["Open", "High", "Low", "Close"],
-        axis=1, inplace=True)
 
-    df.rename(columns={
-        "Adj Open": "Open", "Adj High": "High",
-        "Adj Low": "Low", "Adj Close": "Close"
-    }, inplace=True)
-
-    return df[[c for c in col_order if c in df.columns]]
+def auto_adjust(data, factor=None):
+    # Shallow copy, only adjusted columns get new arrays
+    if factor is None:
+        factor = adjustment_factor(data)
+    df = data.copy(deep=False)
+    for c in ["Open", "High", "Low"]:
+        df[c] = data[c].to_numpy() * factor
+    df["Close"] = data["Adj Close"]
+    del df["Adj Close"]
+    return df
 
 
-def back_adjust(data):
+def back_adjust(data, factor=None):
     """ back-adjusted data to mimic true historical prices """
+    if factor is None:
+        factor = adjustment_factor(data)
+    df = data.copy(deep=False)
+    for c in ["Open", "High", "Low"]:
+        df[c] = data[c].to_numpy() * factor
+    del df["Adj Close"]
+    return df
 
-    col_order = data.columns
-    df = data.copy()
-    ratio = df["Adj Close"] / df["Close"]
-    df["Adj Open"] = df["Open"] * ratio
-    df["Adj High"] = df["High"] * ratio
-    df["Adj Low"] = df["Low"] * ratio
-
-    df.drop(
-        ["Open", "High", "Low", "Adj Close"],
-        axis=1, inplace=True)
-
-    df.rename(columns={
-        "Adj Open": "Open", "Adj High": "High",
-        "Adj Low": "Low"
-    }, inplace=True)
 
-    return df[[c for c in col_order if c in df.columns]]
+def json_loads(s):
+    # Decode JSON (str or bytes) with fastest parser available: orjson, ujson, json
+    if _orjson is not None:
+        try:
+            return _orjson.loads(s)
+        except _orjson.JSONDecodeError:
+            # orjson is strict e.g. rejects NaN, let fallback decide
+            pass
+    return _json.loads(s)
+
+
+# history() column dtypes. Prices are set by parse_quotes(), Volume is always int64.
+dtype_profiles = {
+    'default': {'price': _np.float64, 'sparse_actions': False},
+    'compact': {'price': _np.float32, 'sparse_actions': True},
+}
+
+
+def check_dtype_profile(dtype_profile):
+    if dtype_profile not in dtype_profiles:
+        raise ValueError(f"dtype_profile='{dtype_profile}' must be one of {list(dtype_profiles.keys())}")
+
+
+def apply_dtype_profile(df, dtype_profile):
+    # Enforce profile on final history() frame. Prices are normally already
+    # right from parse_quotes(), so astype only copies if e.g. repair changed them.
+    profile = dtype_profiles[dtype_profile]
+    price_dtype = profile['price']
+    if price_dtype is not None:
+        prices = {c: price_dtype for c in ["Open", "High", "Low", "Close", "Adj Close"]
+                  if c in df.columns and df[c].dtype != price_dtype}
+        if prices:
+            df = df.astype(prices)
+    if profile['sparse_actions']:
+        actions = [c for c in ["Dividends", "Stock Splits", "Capital Gains"] if c in df.columns]
+        if actions:
+            df = df.copy(deep=False)
+            for c in actions:
+                df[c] = _pd.arrays.SparseArray(df[c].to_numpy(dtype=price_dtype or _np.float64), fill_value=0)
+    return df
 
 
-def parse_quotes(data):
-    timestamps = data["timestamp"]
+def parse_quotes(data, dtype_profile='default'):
+    # Convert the JSON lists straight into NumPy arrays (None -> NaN),
+    # prices as one 2D block so DataFrame doesn't copy them again.
+    timestamps = _np.asarray(data["timestamp"], dtype=_np.int64)
     ohlc = data["indicators"]["quote"][0]
-    volumes = ohlc["volume"]
-    opens = ohlc["open"]
     closes = ohlc["close"]
-    lows = ohlc["low"]
-    highs = ohlc["high"]
 
     adjclose = closes
     if "adjclose" in data["indicators"]:
         adjclose = data["indicators"]["adjclose"][0]["adjclose"]
 
-    quotes = _pd.DataFrame({"Open": opens,
-                            "High": highs,
-                            "Low": lows,
-                            "Close": closes,
-                            "Adj Close": adjclose,
-                            "Volume": volumes})
+    price_dtype = dtype_profiles[dtype_profile]['price']
+    prices = _np.array([ohlc["open"], ohlc["high"], ohlc["low"], closes, adjclose], dtype=price_dtype)
 
-    quotes.index = _pd.to_datetime(timestamps, unit="s")
-    quotes.sort_index(inplace=True)
+    volumes = ohlc["volume"]
+    try:
+        volumes = _np.array(volumes, dtype=_np.int64)
+    except (TypeError, ValueError):
+        # Has None or NaN
+        volumes = _np.array(volumes, dtype=_np.float64)
+
+    # Yahoo almost always returns timestamps sorted
+    if timestamps.shape[0] > 1 and (_np.diff(timestamps) < 0).any():
+        order = _np.argsort(timestamps, kind='stable')
+        timestamps = timestamps[order]
+        prices = prices[:, order]
+        volumes = volumes[order]
+
+    index = _pd.DatetimeIndex(timestamps.astype('datetime64[s]').astype('datetime64[ns]'))
+    quotes = _pd.DataFrame(prices.T, index=index, columns=["Open", "High", "Low", "Close", "Adj Close"], copy=False)
+    quotes["Volume"] = volumes
 
     return quotes
 
@@ -556,21 +617,48 @@ def set_df_tz(df, interval, tz):
     return df
 
 
+def _local_dates(index):
+    # Exchange-local calendar dates as datetime64, for vectorised comparison
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize().values
+
+
+def map_trading_sessions(index, tradingPeriods):
+    # Position in 'tradingPeriods' (see format_history_metadata) of the session
+    # each bar belongs to, matched on exchange-local date. -1 = no session that day.
+    # Binary search on session dates, so cheap even for 60 days of 1m bars.
+    tp_dates = _local_dates(tradingPeriods.index)
+    if len(tp_dates) == 0:
+        return _np.full(len(index), -1)
+    order = None
+    if not tradingPeriods.index.is_monotonic_increasing:
+        order = _np.argsort(tp_dates, kind='stable')
+        tp_dates = tp_dates[order]
+    bar_dates = _local_dates(index)
+    pos = _np.minimum(_np.searchsorted(tp_dates, bar_dates, side='left'), len(tp_dates) - 1)
+    f_match = tp_dates[pos] == bar_dates
+    if order is not None:
+        pos = order[pos]
+    return _np.where(f_match, pos, -1)
+
+
 def fix_Yahoo_returning_prepost_unrequested(quotes, interval, tradingPeriods):
     # Sometimes Yahoo returns post-market data despite not requesting it.
     # Normally happens on half-day early closes.
     #
     # And sometimes returns pre-market data despite not requesting it.
     # E.g. some London tickers.
-    tps_df = tradingPeriods.copy()
-    tps_df["_date"] = tps_df.index.date
-    quotes["_date"] = quotes.index.date
-    idx = quotes.index.copy()
-    quotes = quotes.merge(tps_df, how="left")
-    quotes.index = idx
+    pos = map_trading_sessions(quotes.index, tradingPeriods)
+    f_session = pos != -1
+    if not f_session.any():
+        return quotes
+    dts = quotes.index[f_session]
+    pos = pos[f_session]
     # "end" = end of regular trading hours (including any auction)
-    f_drop = quotes.index >= quotes["end"]
-    f_drop = f_drop | (quotes.index < quotes["start"])
+    f_drop = _np.zeros(quotes.shape[0], dtype=bool)
+    f_drop[f_session] = (dts >= _pd.DatetimeIndex(tradingPeriods["end"])[pos]) | \
+                        (dts < _pd.DatetimeIndex(tradingPeriods["start"])[pos])
     if f_drop.any():
         # When printing report, ignore rows that were already NaNs:
         # f_na = quotes[["Open","Close"]].isna().all(axis=1)
@@ -580,10 +668,50 @@ def fix_Yahoo_returning_prepost_unrequested(quotes, interval, tradingPeriods):
         # if debug and n_drop_nna > 0:
         #     print(f"Dropping {n_drop_nna}/{n_nna} intervals for falling outside regular trading hours")
         quotes = quotes[~f_drop]
-    quotes = quotes.drop(["_date", "start", "end"], axis=1)
     return quotes
 
 
+# How resample_history() aggregates each column, same as price repair
+_resample_agg = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Adj Close": "last",
+                 "Volume": "sum", "Dividends": "sum", "Stock Splits": "max", "Capital Gains": "sum"}
+
+
+def resample_history(df, interval, tradingPeriods=None):
+    # Aggregate price history into a coarser interval, e.g. 5m -> 1h or 1h -> 1d.
+    # Intraday bars are anchored to session open from 'tradingPeriods'
+    # (see format_history_metadata), so e.g. NYSE 1h bars start 9:30 like Yahoo's.
+    if interval not in ["2m", "5m", "15m", "30m", "60m", "90m", "1h", "1d", "1wk", "1mo", "3mo"]:
+        raise ValueError(f"Cannot resample to interval '{interval}'")
+    if df.shape[0] == 0:
+        return df
+
+    idx = df.index
+    days = idx.normalize()
+    if interval[-1] in ('m', 'h'):
+        td = _pd.Timedelta(interval.replace('m', 'min'))
+        opens = days
+        if isinstance(tradingPeriods, _pd.DataFrame) and "start" in tradingPeriods.columns:
+            pos = map_trading_sessions(idx, tradingPeriods)
+            starts = _pd.DatetimeIndex(tradingPeriods["start"])
+            if len(starts) > 0:
+                if idx.tz is not None:
+                    starts = starts.tz_convert(idx.tz)
+                opens = days.where(pos == -1, starts[_np.maximum(pos, 0)])
+        keys = opens + ((idx - opens) // td) * td
+    elif interval == "1d":
+        keys = days
+    elif interval == "1wk":
+        keys = days - _pd.to_timedelta(days.weekday, unit='D')
+    else:
+        freq = "M" if interval == "1mo" else "Q"
+        keys = idx.tz_localize(None).to_period(freq).start_time.tz_localize(idx.tz)
+
+    agg = {c: f for c, f in _resample_agg.items() if c in df.columns}
+    df_new = df.groupby(keys).agg(agg)[[c for c in df.columns if c in agg]]
+    df_new.index.name = "Datetime" if interval[-1] in ('m', 'h') else "Date"
+    return df_new
+
+
 def fix_Yahoo_returning_live_separate(quotes, interval, tz_exchange):
     # Yahoo bug fix. If market is open today then Yahoo normally returns 
     # todays data as a separate row from rest-of week/month interval in above row. 
@@ -650,112 +778,80 @@ def safe_merge_dfs(df_main, df_sub, interval):
     if df_main.empty:
         return df_main
 
-    df_sub_backup = df_sub.copy()
     data_cols = [c for c in df_sub.columns if c not in df_main]
     if len(data_cols) > 1:
         raise Exception("Expected 1 data col")
     data_col = data_cols[0]
 
-    df_main = df_main.sort_index()
+    if not df_main.index.is_monotonic_increasing:
+        df_main = df_main.sort_index()
     intraday = interval.endswith('m') or interval.endswith('s')
 
     td = _interval_to_timedelta(interval)
-    if intraday:
-        # On some exchanges the event can occur before market open.
-        # Problem when combining with intraday data.
-        # Solution = use dates, not datetimes, to map/merge.
-        df_main['_date'] = df_main.index.date
-        df_sub['_date'] = df_sub.index.date
-        indices = _np.searchsorted(_np.append(df_main['_date'], [df_main['_date'].iloc[-1]+td]), df_sub['_date'], side='left')
-        df_main = df_main.drop('_date', axis=1)
-        df_sub = df_sub.drop('_date', axis=1)
-    else:
-        indices = _np.searchsorted(_np.append(df_main.index, df_main.index[-1] + td), df_sub.index, side='right')
-        indices -= 1  # Convert from [[i-1], [i]) to [[i], [i+1])
-    # Numpy.searchsorted does not handle out-of-range well, so handle manually:
-    if intraday:
-        for i in range(len(df_sub.index)):
-            dt = df_sub.index[i].date()
-            if dt < df_main.index[0].date() or dt >= df_main.index[-1].date() + _datetime.timedelta(days=1):
-                # Out-of-range
-                indices[i] = -1
-    else:
-        for i in range(len(df_sub.index)):
-            dt = df_sub.index[i]
-            if dt < df_main.index[0] or dt >= df_main.index[-1] + td:
-                # Out-of-range
-                indices[i] = -1
 
+    def _map_events(main_index):
+        # Position in main_index of the row each event belongs to, -1 = out-of-range
+        if intraday:
+            # On some exchanges the event can occur before market open.
+            # Problem when combining with intraday data.
+            # Solution = use dates, not datetimes, to map/merge.
+            main_dates = _local_dates(main_index)
+            sub_dates = _local_dates(df_sub.index)
+            indices = _np.searchsorted(main_dates, sub_dates, side='left')
+            f_outOfRange = (sub_dates < main_dates[0]) | (sub_dates >= main_dates[-1] + _np.timedelta64(1, 'D'))
+        else:
+            indices = _np.searchsorted(main_index, df_sub.index, side='right')
+            indices -= 1  # Convert from [[i-1], [i]) to [[i], [i+1])
+            f_outOfRange = (df_sub.index < main_index[0]) | (df_sub.index >= main_index[-1] + td)
+        indices[f_outOfRange] = -1
+        return indices
+
+    indices = _map_events(df_main.index)
     f_outOfRange = indices == -1
     if f_outOfRange.any():
         if intraday:
             # Discard out-of-range dividends in intraday data, assume user not interested
             df_sub = df_sub[~f_outOfRange]
             if df_sub.empty:
-                df_main['Dividends'] = 0.0
-                return df_main
+                return df_main.assign(Dividends=0.0)
+            indices = indices[~f_outOfRange]
         else:
-            empty_row_data = {**{c:[_np.nan] for c in const.price_colnames}, 'Volume':[0]}
-            if interval == '1d':
-                # For 1d, add all out-of-range event dates
-                for i in _np.where(f_outOfRange)[0]:
-                    dt = df_sub.index[i]
-                    get_yf_logger().debug(f"Adding out-of-range {data_col} @ {dt.date()} in new prices row of NaNs")
-                    empty_row = _pd.DataFrame(data=empty_row_data, index=[dt])
-                    df_main = _pd.concat([df_main, empty_row], sort=True)
-            else:
-                # Else, only add out-of-range event dates if occurring in interval 
+            new_dts = df_sub.index[f_outOfRange]
+            if interval != '1d':
+                # Only add out-of-range event dates if occurring in interval
                 # immediately after last price row
-                last_dt = df_main.index[-1]
-                next_interval_start_dt = last_dt + td
+                next_interval_start_dt = df_main.index[-1] + td
                 next_interval_end_dt = next_interval_start_dt + td
-                for i in _np.where(f_outOfRange)[0]:
-                    dt = df_sub.index[i]
-                    if next_interval_start_dt <= dt < next_interval_end_dt:
-                        new_dt = next_interval_start_dt
-                        get_yf_logger().debug(f"Adding out-of-range {data_col} @ {dt.date()} in new prices row of NaNs")
-                        empty_row = _pd.DataFrame(data=empty_row_data, index=[dt])
-                        df_main = _pd.concat([df_main, empty_row], sort=True)
-            df_main = df_main.sort_index()
-
-            # Re-calculate indices
-            indices = _np.searchsorted(_np.append(df_main.index, df_main.index[-1] + td), df_sub.index, side='right')
-            indices -= 1  # Convert from [[i-1], [i]) to [[i], [i+1])
-            # Numpy.searchsorted does not handle out-of-range well, so handle manually:
-            for i in range(len(df_sub.index)):
-                dt = df_sub.index[i]
-                if dt < df_main.index[0] or dt >= df_main.index[-1] + td:
-                    # Out-of-range
-                    indices[i] = -1
+                new_dts = new_dts[(new_dts >= next_interval_start_dt) & (new_dts < next_interval_end_dt)]
+            if len(new_dts) > 0:
+                get_yf_logger().debug(f"Adding out-of-range {data_col} @ {list(new_dts.date)} in new prices rows of NaNs")
+                empty_rows = _pd.DataFrame(data={**{c: _np.nan for c in const.price_colnames}, 'Volume': 0}, index=new_dts)
+                df_main = _pd.concat([df_main, empty_rows], sort=True).sort_index()
+                indices = _map_events(df_main.index)
 
     f_outOfRange = indices == -1
     if f_outOfRange.any():
         if intraday or interval in ['1d', '1wk']:
             raise Exception(f"The following '{data_col}' events are out-of-range, did not expect with interval {interval}: {df_sub.index[f_outOfRange]}")
         get_yf_logger().debug(f'Discarding these {data_col} events:' + '\n' + str(df_sub[f_outOfRange]))
-        df_sub = df_sub[~f_outOfRange].copy()
+        df_sub = df_sub[~f_outOfRange]
         indices = indices[~f_outOfRange]
 
     def _reindex_events(df, new_index, data_col_name):
-        if len(new_index) == len(set(new_index)):
+        if not new_index.has_duplicates:
             # No duplicates, easy
-            df.index = new_index
-            return df
+            return df.set_axis(new_index)
 
-        df["_NewIndex"] = new_index
         # Duplicates present within periods but can aggregate
         if data_col_name in ["Dividends", "Capital Gains"]:
             # Add
-            df = df.groupby("_NewIndex").sum()
-            df.index.name = None
+            df = df.groupby(new_index).sum()
         elif data_col_name == "Stock Splits":
             # Product
-            df = df.groupby("_NewIndex").prod()
-            df.index.name = None
+            df = df.groupby(new_index).prod()
         else:
             raise Exception(f"New index contains duplicates but unsure how to aggregate for '{data_col_name}'")
-        if "_NewIndex" in df.columns:
-            df = df.drop("_NewIndex", axis=1)
+        df.index.name = None
         return df
 
     new_index = df_main.index[indices]
@@ -763,7 +859,7 @@ def safe_merge_dfs(df_main, df_sub, interval):
 
     df = df_main.join(df_sub)
     f_na = df[data_col].isna()
-    data_lost = sum(~f_na) < df_sub.shape[0]
+    data_lost = (~f_na).sum() < df_sub.shape[0]
     if data_lost:
         raise Exception('Data was lost in merge, investigate')
 
@@ -816,7 +912,7 @@ def format_history_metadata(md, tradingPeriodsOnly=True):
 
     if "tradingPeriods" in md:
         tps = md["tradingPeriods"]
-        if tps == {"pre": [], "post": []}:
+        if isinstance(tps, dict) and tps == {"pre": [], "post": []}:
             # Ignore
             pass
         elif isinstance(tps, (list, dict)):